@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from analytics.topk import top_k
+
+PRODUCT_ATTRIBUTES = ["product_name", "brand", "subcategory"]
+
+_worker_items = None
+
+
+def _init_worker(items):
+    global _worker_items
+    _worker_items = items
+
+
+def _block_neighbors(block, k):
+    # One block of rows of the item-item cosine matrix as a sparse product,
+    # then the k best columns per row: nonzeros are sorted by (row, -score)
+    # and ranked within their row, so no row is ever densified.
+    start, stop = block
+    sims = (_worker_items[start:stop] @ _worker_items.T).tocoo()
+    rows, cols, vals = sims.row, sims.col, sims.data
+    keep = cols != rows + start
+    rows, cols, vals = rows[keep], cols[keep], vals[keep]
+
+    order = np.lexsort((-vals, rows))
+    rows, cols, vals = rows[order], cols[order], vals[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows, side="left")
+    take = rank < k
+
+    indices = np.full((stop - start, k), -1, dtype=np.int32)
+    scores = np.zeros((stop - start, k), dtype=np.float32)
+    indices[rows[take], rank[take]] = cols[take]
+    scores[rows[take], rank[take]] = vals[take]
+    return start, indices, scores
+
+
+class InteractionMatrix:
+    def __init__(self, df):
+        customer_codes, self.customers = pd.factorize(df["customer_id"])
+        product_codes, self.products = pd.factorize(df["product_id"])
+        brand_codes, self.brands = pd.factorize(df["brand"])
+        shape = (len(self.customers), len(self.products))
+
+        # Duplicate (customer, product) pairs are summed by the COO -> CSR
+        # conversion, so each cell holds the units bought over the history.
+        valid = (customer_codes >= 0) & (product_codes >= 0)
+        quantity = df["quantity"].to_numpy(dtype=np.float32)
+        self.purchases = sp.coo_matrix(
+            (quantity[valid], (customer_codes[valid], product_codes[valid])), shape=shape
+        ).tocsr()
+        self.buyers = self.purchases.astype(bool).astype(np.float32)
+        self.by_product = self.buyers.T.tocsr()
+
+        valid = (customer_codes >= 0) & (brand_codes >= 0)
+        amount = df["final_amount_inr"].to_numpy(dtype=np.float64)
+        self.brand_spend = sp.coo_matrix(
+            (amount[valid], (customer_codes[valid], brand_codes[valid])),
+            shape=(len(self.customers), len(self.brands)),
+        ).tocsr()
+
+        self.product_info = (
+            df.drop_duplicates("product_id")
+            .set_index("product_id")[PRODUCT_ATTRIBUTES]
+            .reindex(self.products)
+            .rename_axis("product_id")
+        )
+        self.product_info["buyers"] = np.diff(self.by_product.indptr)
+        self.customer_tier = (
+            df.drop_duplicates("customer_id", keep="last")
+            .set_index("customer_id")["customer_tier"]
+            .reindex(self.customers)
+            .to_numpy()
+        )
+
+        self.neighbors = None
+        self.neighbor_scores = None
+        # Built once with the matrix; the page only reads it.
+        self.tier_brand = self._tier_brand_affinity()
+
+    @property
+    def density(self):
+        rows, cols = self.purchases.shape
+        return self.purchases.nnz / max(rows * cols, 1)
+
+    def stats(self):
+        return {
+            "customers": len(self.customers),
+            "products": len(self.products),
+            "pairs": self.purchases.nnz,
+            "density": self.density,
+        }
+
+    def product_options(self, limit=1000):
+        # The most purchased products first, for the product picker.
+        return self.product_info.sort_values("buyers", ascending=False).iloc[:limit]
+
+    def compute_neighbors(self, k=20, block_size=2048, workers=None):
+        # Cosine similarity between product columns of the binary purchase
+        # matrix: scale each product by 1/sqrt(buyers), then S = X^T X.
+        counts = self.product_info["buyers"].to_numpy(dtype=np.float32)
+        scale = sp.diags(np.divide(1, np.sqrt(counts), out=np.zeros_like(counts), where=counts > 0))
+        items = (scale @ self.by_product).tocsr()
+
+        n = items.shape[0]
+        blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+        self.neighbors = np.full((n, k), -1, dtype=np.int32)
+        self.neighbor_scores = np.zeros((n, k), dtype=np.float32)
+
+        workers = workers or min(len(blocks), os.cpu_count() or 1)
+        # Spawned workers: this runs inside the threaded Streamlit server,
+        # and forking a process that has other threads running is unsafe.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(items,)
+        ) as pool:
+            for start, indices, scores in pool.map(_block_neighbors, blocks, [k] * len(blocks)):
+                self.neighbors[start:start + len(indices)] = indices
+                self.neighbor_scores[start:start + len(indices)] = scores
+        return self
+
+    def _products(self, codes, **columns):
+        result = self.product_info.iloc[codes].reset_index()
+        for name, values in columns.items():
+            result[name] = values
+        return result
+
+    def similar(self, product_id, k=10):
+        j = self.products.get_loc(product_id)
+        codes = self.neighbors[j, :k]
+        found = codes >= 0
+        return self._products(codes[found], similarity=self.neighbor_scores[j, :k][found])
+
+    def also_bought(self, product_id, k=10):
+        # Everything the buyers of this product bought over their history:
+        # one sparse row selection and one column sum.
+        j = self.products.get_loc(product_id)
+        buyers = self.by_product[j].indices
+        counts = pd.Series(np.asarray(self.buyers[buyers].sum(axis=0)).ravel())
+        counts.iloc[j] = 0
+        top = top_k(counts[counts > 0], k)
+
+        share = top.to_numpy() / max(len(buyers), 1)
+        penetration = self.product_info["buyers"].to_numpy()[top.index] / max(len(self.customers), 1)
+        return self._products(
+            top.index.to_numpy(),
+            co_buyers=top.to_numpy(),
+            share_of_buyers_pct=share * 100,
+            lift=np.divide(share, penetration, out=np.full(len(share), np.nan), where=penetration > 0),
+        )
+
+    def brand_affinity(self):
+        return self.tier_brand
+
+    def _tier_brand_affinity(self):
+        # Tier x brand spend as one sparse product of a tier indicator matrix
+        # with the customer x brand matrix. Affinity is the brand's share of
+        # the tier's spend over its share of all spend (1.0 = average).
+        tier_codes, tiers = pd.factorize(self.customer_tier)
+        valid = tier_codes >= 0
+        indicator = sp.csr_matrix(
+            (np.ones(valid.sum()), (tier_codes[valid], np.flatnonzero(valid))),
+            shape=(len(tiers), len(self.customers)),
+        )
+        spend = np.asarray((indicator @ self.brand_spend).todense())
+        buyers = np.asarray((indicator @ self.brand_spend.astype(bool).astype(np.float64)).todense())
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tier_share = spend / spend.sum(axis=1, keepdims=True)
+            affinity = tier_share / (spend.sum(axis=0) / spend.sum())
+
+        t, b = len(tiers), len(self.brands)
+        return pd.DataFrame({
+            "customer_tier": np.repeat(np.asarray(tiers), b),
+            "brand": np.tile(np.asarray(self.brands), t),
+            "spend": spend.ravel(),
+            "buyers": buyers.ravel(),
+            "share_of_tier_pct": tier_share.ravel() * 100,
+            "affinity": affinity.ravel(),
+        })
@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analytics import shared
+from analytics.data import create_db_engine, read_data_version, read_dataset
+
+SLICES = [
+    ("customer_state",),
+    ("subcategory",),
+    ("brand",),
+    ("payment_method",),
+    ("customer_tier",),
+    ("customer_state", "subcategory"),
+]
+ANOMALY_PATH = os.environ.get("AMAZON_ANOMALIES", os.path.join("reports", "anomalies.parquet"))
+MISSING = "(missing)"
+SEASON = 12
+WINDOW = 3
+
+
+def monthly_matrix(df, slices=SLICES):
+    # Every slice of every dimension becomes one row of a (slices x months)
+    # matrix, so all series are scored together.
+    years = df["order_year"].to_numpy(dtype=np.int64)
+    first_year = years.min()
+    month = (years - first_year) * 12 + df["order_month"].to_numpy(dtype=np.int64) - 1
+    months = month.max() + 1
+    amount = df["final_amount_inr"].to_numpy(dtype=float)
+
+    labels = []
+    revenue = []
+    orders = []
+    for dims in slices:
+        # dropna=False: a null key is its own "(missing)" slice, and every
+        # row gets an integer group code.
+        grouped = df.groupby(list(dims), sort=True, observed=True, dropna=False)
+        codes = grouped.ngroup().to_numpy(dtype=np.int64)
+        cells = grouped.size().index.to_frame(index=False).astype(object)
+        cells = cells.where(cells.notna(), MISSING)
+        flat = codes * months + month
+        size = len(cells) * months
+        revenue.append(np.bincount(flat, amount, minlength=size).reshape(len(cells), months))
+        orders.append(np.bincount(flat, minlength=size).reshape(len(cells), months))
+        labels.append(pd.DataFrame({
+            "dimension": " × ".join(dims),
+            "slice": cells.astype(str).agg(" / ".join, axis=1),
+        }))
+
+    index = pd.period_range(f"{first_year}-01", periods=months, freq="M")
+    totals = np.bincount(month, amount, minlength=months)
+    return pd.concat(labels, ignore_index=True), index, np.vstack(revenue), np.vstack(orders), totals
+
+
+def seasonal_scores(values, eps=1.0, season=SEASON, window=WINDOW):
+    # Baseline: the same month last year, scaled by the slice's year-on-year
+    # change over the preceding `window` months. Residuals are log ratios,
+    # scored per series with a median/MAD z so one bad month does not inflate
+    # its own threshold.
+    rows, months = values.shape
+    expected = np.full((rows, months), np.nan)
+    residual = np.full((rows, months), np.nan)
+    t = np.arange(season + window, months)
+    if len(t):
+        csum = np.concatenate([np.zeros((rows, 1)), np.cumsum(values, axis=1)], axis=1)
+        recent = csum[:, t] - csum[:, t - window]
+        prior = csum[:, t - season] - csum[:, t - season - window]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            trend = np.where(prior > 0, recent / prior, np.nan)
+        expected[:, t] = values[:, t - season] * trend
+        residual[:, t] = np.log((values[:, t] + eps) / (expected[:, t] + eps))
+
+    with warnings.catch_warnings():
+        # Series too short for a baseline are all-NaN and score as NaN.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(residual, axis=1, keepdims=True)
+        mad = 1.4826 * np.nanmedian(np.abs(residual - median), axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.where(mad > 0, (residual - median) / mad, np.nan)
+    return expected, z
+
+
+def detect_anomalies(df, slices=SLICES, threshold=3.5, min_orders=30):
+    labels, index, revenue, orders, totals = monthly_matrix(df, slices)
+
+    # A slice's share of each month's revenue, so mix shifts (e.g. a payment
+    # method losing share while the total grows) are caught too.
+    share = np.divide(revenue, totals, out=np.zeros_like(revenue), where=totals > 0)
+
+    expected_orders, _ = seasonal_scores(orders.astype(float))
+    frames = []
+    for metric, actual, eps in [("revenue", revenue, 1.0), ("share", share, 1e-4)]:
+        expected, z = seasonal_scores(actual, eps)
+        flagged = (np.abs(z) >= threshold) & (np.fmax(orders, expected_orders) >= min_orders)
+        row, col = np.nonzero(flagged)
+        e, a = expected[row, col], actual[row, col]
+        frames.append(pd.DataFrame({
+            "dimension": labels["dimension"].to_numpy()[row],
+            "slice": labels["slice"].to_numpy()[row],
+            "month": index[col].astype(str),
+            "metric": metric,
+            "actual": a,
+            "expected": e,
+            "change_pct": np.divide(a - e, e, out=np.full(len(e), np.nan), where=e > 0) * 100,
+            "z_score": z[row, col],
+        }))
+
+    anomalies = pd.concat(frames, ignore_index=True)
+    anomalies["direction"] = np.where(anomalies["z_score"] < 0, "drop", "spike")
+    anomalies["severity"] = anomalies["z_score"].abs()
+    return anomalies.sort_values(["month", "severity"], ascending=False, ignore_index=True)
+
+
+def save(anomalies, version, path=ANOMALY_PATH):
+    # The version lives in the file's schema metadata, so a run that found
+    # no anomalies is stored (and reused) like any other.
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    table = pa.Table.from_pandas(anomalies, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"data_version": str(version).encode()})
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
+def load_stored(version, path=ANOMALY_PATH):
+    # Stored results are only used when they were computed for this version.
+    if not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    if (table.schema.metadata or {}).get(b"data_version") != str(version).encode():
+        return None
+    return table.to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every month x slice series and store flagged anomalies.")
+    parser.add_argument("--out", default=ANOMALY_PATH)
+    parser.add_argument("--threshold", type=float, default=3.5)
+    parser.add_argument("--interval", type=int, default=0, help="check for a data refresh every N seconds")
+    parser.add_argument("--shared-root", default=os.environ.get("AMAZON_SHARED_DATA", ""))
+    args = parser.parse_args(argv)
+
+    # Results are tagged with the version string the dashboards read: the
+    # shared CURRENT pointer in shared mode, the database version otherwise.
+    if args.shared_root:
+        read_version = lambda: shared.current_version(args.shared_root)
+        load = lambda version: shared.attach(args.shared_root, version)
+    else:
+        engine = create_db_engine()
+        read_version = lambda: read_data_version(engine)
+        load = lambda version: read_dataset(engine)
+
+    scored = None
+    while True:
+        version = read_version()
+        if version != scored:
+            started = time.perf_counter()
+            anomalies = detect_anomalies(load(version), threshold=args.threshold)
+            save(anomalies, version, args.out)
+            scored = version
+            print(f"{len(anomalies)} anomalies for version {version} in {time.perf_counter() - started:.1f}s")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+from streamlit.web import cli as stcli
+
+from analytics import cache, plots
+
+HOME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Home.py")
+
+
+def warm():
+    started = time.perf_counter()
+    plots.pyplot()
+    plots.seaborn()
+    imported = time.perf_counter()
+
+    version = cache.warm()
+    loaded = time.perf_counter()
+
+    timings = cache.warm_structures(version)
+    built = time.perf_counter()
+
+    print(
+        f"Warm-up: imports {imported - started:.2f}s, "
+        f"dataset {version} {loaded - imported:.2f}s, "
+        f"structures {built - loaded:.2f}s "
+        f"({', '.join(f'{name} {seconds:.2f}s' for name, seconds in timings.items())})"
+    )
+    return version
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    warm()
+    sys.argv = ["streamlit", "run", HOME, *argv]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()
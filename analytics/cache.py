@@ -0,0 +1,193 @@
+import os
+import time
+from functools import lru_cache
+
+import pandas as pd
+import streamlit as st
+
+from analytics import client, shared
+from analytics.data import (
+    SYNTHETIC_ROWS,
+    VERSION_TTL,
+    create_db_engine,
+    read_data_version,
+    read_dataset,
+    read_synthetic_dataset,
+)
+from analytics.metrics import SECTIONS
+from analytics.structures import BUILDERS, QUERIES, REFRESHERS, build, run_query
+
+SHARED_ROOT = os.environ.get("AMAZON_SHARED_DATA", "")
+
+# Every page imports this module (pages opened directly never run Home.py),
+# and all of them share the cached frames: with copy-on-write a page that
+# adds or overwrites a column gets its own copy instead of mutating them.
+pd.set_option("mode.copy_on_write", True)
+
+_prewarmed = {}
+# The newest build of each refreshable structure, carried forward to the
+# next data version instead of rebuilding from scratch.
+_latest = {}
+
+
+@lru_cache(maxsize=None)
+def get_engine():
+    return create_db_engine()
+
+
+def current_version():
+    if client.API_URL:
+        return client.fetch_version()
+    if SYNTHETIC_ROWS:
+        return f"synthetic-{SYNTHETIC_ROWS}"
+    if SHARED_ROOT:
+        return shared.current_version(SHARED_ROOT)
+    return read_data_version(get_engine())
+
+
+def read_current(version):
+    if SYNTHETIC_ROWS:
+        return read_synthetic_dataset(SYNTHETIC_ROWS)
+    if SHARED_ROOT:
+        return shared.attach(SHARED_ROOT, version)
+    return read_dataset(get_engine())
+
+
+def warm():
+    version = current_version()
+    if not client.API_URL:
+        _prewarmed["dataset", version] = read_current(version)
+    return version
+
+
+def warm_structures(version, names=None):
+    # Built before the server starts and handed over to load_structure on
+    # first use; returns seconds per structure. With AMAZON_API_URL set the
+    # structures live on the service, so there is nothing to build here.
+    if client.API_URL:
+        return {}
+    dataset = _prewarmed.get(("dataset", version))
+    timings = {}
+    for name in names or BUILDERS:
+        started = time.perf_counter()
+        _prewarmed[name, version] = _build(name, lambda: dataset, version)
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _take_prewarmed(name, version):
+    # Anything warmed for another version is dropped rather than kept until
+    # that version is asked for again, which may be never.
+    for key in [key for key in list(_prewarmed) if key[1] != version]:
+        _prewarmed.pop(key, None)
+    return _prewarmed.pop((name, version), None)
+
+@st.cache_data(ttl=VERSION_TTL)
+def data_version():
+    return current_version()
+
+@st.cache_resource(max_entries=2)
+def load_dataset(version):
+    dataset = _take_prewarmed("dataset", version)
+    return dataset if dataset is not None else read_current(version)
+
+def _filter_key(filters):
+    # Hashable and order-independent, so equal selections share an entry.
+    return tuple(sorted((column, tuple(values)) for column, values in filters.items()))
+
+def _filtered(df, filters):
+    for column, values in filters:
+        df = df[df[column].isin(values)]
+    return df
+
+def _build(name, load, version):
+    previous = _latest.get(name)
+    structure = build(name, load, version, previous[1] if previous and previous[0] != version else None)
+    if name in REFRESHERS:
+        _latest[name] = (version, structure)
+    return structure
+
+@st.cache_resource(max_entries=16)
+def load_structure(name, version):
+    structure = _take_prewarmed(name, version)
+    return structure if structure is not None else _build(name, lambda: load_dataset(version), version)
+
+@st.cache_data(max_entries=512)
+def load_query(version, name, method, args, kwargs):
+    # With AMAZON_API_URL set the service answers from the structures it
+    # keeps; otherwise the structure is built here from the cached dataset.
+    if client.API_URL:
+        return client.fetch_query(name, method, *args, **dict(kwargs))
+    return run_query(load_structure(name, version), name, method, args, dict(kwargs))
+
+class Structure:
+    # A per-version structure as the pages see it: each whitelisted method
+    # call is one cached query, answered locally or by the service.
+    def __init__(self, name, version):
+        self.name = name
+        self.version = version
+
+    def __getattr__(self, method):
+        if method.startswith("_") or method not in QUERIES[self.name]:
+            raise AttributeError(f"{self.name} has no query {method!r}")
+
+        def call(*args, **kwargs):
+            return load_query(self.version, self.name, method, args, tuple(sorted(kwargs.items())))
+        return call
+
+def topk_index():
+    return Structure("topk", data_version())
+
+def moment_cube():
+    return Structure("moments", data_version())
+
+def sketch_cube():
+    return Structure("sketches", data_version())
+
+def customer_features():
+    return Structure("customers", data_version())
+
+def anomalies():
+    return Structure("anomalies", data_version()).table()
+
+def pricing_model():
+    return Structure("pricing", data_version())
+
+def interactions():
+    return Structure("interactions", data_version())
+
+@st.cache_data(max_entries=256)
+def load_section(version, name, filters):
+    if client.API_URL:
+        return client.fetch_section(name, **dict(filters))
+    return SECTIONS[name](_filtered(load_dataset(version), filters))
+
+def section_metrics(name, **filters):
+    return load_section(data_version(), name, _filter_key(filters))
+
+@st.cache_data(max_entries=512)
+def load_aggregate(version, by, value, agg, top, filters):
+    if client.API_URL:
+        return client.fetch_groupby(list(by), value, agg, top, **dict(filters))
+    result = _filtered(load_dataset(version), filters).groupby(list(by))[value].agg(agg)
+    return result.nlargest(top) if top else result
+
+def aggregate(by, value, agg="sum", top=None, **filters):
+    # One groupby over the filtered transactions, answered by the aggregate
+    # service when AMAZON_API_URL is set.
+    by = (by,) if isinstance(by, str) else tuple(by)
+    return load_aggregate(data_version(), by, value, agg, top, _filter_key(filters))
+
+@st.cache_data(max_entries=64)
+def load_sample(version, columns, n, filters):
+    if client.API_URL:
+        return client.fetch_sample(list(columns), n, **dict(filters))
+    df = _filtered(load_dataset(version), filters)
+    return df[list(columns)].sample(n=min(n, len(df)), random_state=0).reset_index(drop=True)
+
+def sample(columns, n=5000, **filters):
+    # Row-level charts (scatters, histograms) draw a fixed-size sample.
+    return load_sample(data_version(), tuple(columns), n, _filter_key(filters))
+
+def distinct(column, **filters):
+    return aggregate(column, column, "count", **filters).index.tolist()
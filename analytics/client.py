@@ -0,0 +1,66 @@
+import json
+import os
+from urllib.parse import quote, urlencode
+from urllib.request import urlopen
+
+from analytics.server import ARROW_MIME, from_arrow
+
+API_URL = os.environ.get("AMAZON_API_URL", "")
+
+
+def _json_value(value):
+    # numpy scalars (years, flags) from the pages' selections.
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def _query(filters, **params):
+    if filters:
+        encoded = {k: list(values) for k, values in filters.items()}
+        params["filters"] = json.dumps(encoded, sort_keys=True, default=_json_value)
+    return "?" + urlencode(params) if params else ""
+
+
+def _get(path, timeout=30):
+    with urlopen(API_URL.rstrip("/") + path, timeout=timeout) as response:
+        return response.read()
+
+
+def fetch_version():
+    health = json.loads(_get("/health", timeout=5))
+    return f"api-{health['started']}-{health['version']}"
+
+
+def fetch_section(name, **filters):
+    query = _query(filters)
+    payload = json.loads(_get(f"/kpis/{name}{query}"))
+
+    result = dict(payload["scalars"])
+    for table in payload["tables"]:
+        result[table] = from_arrow(_get(f"/kpis/{name}/{quote(table)}{query}"))
+    return result
+
+
+def fetch_groupby(by, value, agg="sum", top=None, **filters):
+    params = {"by": ",".join(by) if isinstance(by, (list, tuple)) else by, "value": value, "agg": agg}
+    if top:
+        params["top"] = top
+    return from_arrow(_get(f"/groupby{_query(filters, **params)}"))
+
+
+def fetch_sample(columns, n, **filters):
+    return from_arrow(_get(f"/sample{_query(filters, columns=','.join(columns), n=n)}"))
+
+
+def fetch_query(name, method, *args, **kwargs):
+    # The structures stay on the service; only this call's result comes back.
+    query = urlencode({
+        "args": json.dumps(args, default=_json_value),
+        "kwargs": json.dumps(kwargs, sort_keys=True, default=_json_value),
+    })
+    url = f"{API_URL.rstrip('/')}/query/{quote(name)}/{quote(method)}?{query}"
+    with urlopen(url, timeout=600) as response:
+        body = response.read()
+        content_type = response.headers.get_content_type()
+    if content_type == ARROW_MIME:
+        return from_arrow(body)
+    return json.loads(body)["result"]
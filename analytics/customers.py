@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+ATTRIBUTES = ["customer_tier", "customer_state", "is_prime_member"]
+SEGMENTS = [
+    "Champions",
+    "Loyal Customers",
+    "New Customers",
+    "Potential Loyalists",
+    "At Risk",
+    "Hibernating",
+    "Needs Attention",
+]
+# F score from the order count itself: 1, 2, 3, 4-5 and 6+ orders.
+FREQUENCY_BINS = [2, 3, 4, 6]
+# Day-number sentinels for customer/year cells without orders; the "last"
+# sentinel is also NaT when viewed as datetime64.
+_NO_FIRST = np.iinfo(np.int64).max
+_NO_LAST = np.iinfo(np.int64).min
+
+
+def _score(values, ascending=True):
+    # Quintile score 1-5 by percentile rank; tied values share a score.
+    pct = pd.Series(values).rank(method="average", pct=True, ascending=ascending).to_numpy()
+    return np.ceil(pct * 5).clip(1, 5).astype(np.int8)
+
+
+def _frequency_score(orders):
+    return (np.digitize(orders, FREQUENCY_BINS) + 1).astype(np.int8)
+
+
+def _segment(r, f, orders):
+    # Single-order customers are classified before any frequency rule.
+    rules = [
+        ((r >= 4) & (orders == 1), "New Customers"),
+        ((r >= 4) & (f >= 4), "Champions"),
+        (f >= 4, "Loyal Customers"),
+        ((r >= 4) & (f >= 2), "Potential Loyalists"),
+        ((r <= 2) & (f >= 3), "At Risk"),
+        ((r <= 2) & (f <= 2), "Hibernating"),
+    ]
+    return np.select([c for c, _ in rules], [s for _, s in rules], default="Needs Attention")
+
+
+class CustomerFeatures:
+    def __init__(self):
+        self.ids = pd.Index([], dtype=object)
+        self.years = []
+        self.orders = np.zeros((0, 0), dtype=np.int32)
+        self.spend = np.zeros((0, 0))
+        # First and last order day number per customer and year.
+        self.first_day = np.zeros((0, 0), dtype=np.int64)
+        self.last_day = np.zeros((0, 0), dtype=np.int64)
+        self.attributes = pd.DataFrame(columns=ATTRIBUTES)
+
+    @classmethod
+    def from_transactions(cls, df):
+        features = cls()
+        features.update(df)
+        return features
+
+    def _grow(self, new_ids, new_years):
+        if len(new_ids):
+            n = len(new_ids)
+            self.ids = self.ids.append(pd.Index(new_ids))
+            self.orders = np.vstack([self.orders, np.zeros((n, self.orders.shape[1]), dtype=np.int32)])
+            self.spend = np.vstack([self.spend, np.zeros((n, self.spend.shape[1]))])
+            self.first_day = np.vstack([self.first_day, np.full((n, self.first_day.shape[1]), _NO_FIRST)])
+            self.last_day = np.vstack([self.last_day, np.full((n, self.last_day.shape[1]), _NO_LAST)])
+            self.attributes = pd.concat(
+                [self.attributes, pd.DataFrame(index=range(n), columns=ATTRIBUTES)], ignore_index=True
+            )
+        if len(new_years):
+            old_years = self.years
+            self.years = sorted(set(old_years) | set(new_years))
+            old = [self.years.index(y) for y in old_years]
+            orders = np.zeros((len(self.ids), len(self.years)), dtype=np.int32)
+            spend = np.zeros((len(self.ids), len(self.years)))
+            first_day = np.full((len(self.ids), len(self.years)), _NO_FIRST)
+            last_day = np.full((len(self.ids), len(self.years)), _NO_LAST)
+            orders[:, old] = self.orders
+            spend[:, old] = self.spend
+            first_day[:, old] = self.first_day
+            last_day[:, old] = self.last_day
+            self.orders, self.spend = orders, spend
+            self.first_day, self.last_day = first_day, last_day
+
+    def update(self, transactions):
+        dates = pd.to_datetime(transactions["order_date"]).to_numpy().astype("datetime64[D]")
+        batch = pd.DataFrame({
+            "customer_id": transactions["customer_id"].to_numpy(),
+            "order_year": transactions["order_year"].to_numpy(),
+            "order_date": dates,
+            "amount": transactions["final_amount_inr"].to_numpy(dtype=float),
+        })
+
+        new_ids = pd.Index(batch["customer_id"].unique()).difference(self.ids)
+        new_years = sorted(set(batch["order_year"].unique()) - set(self.years))
+        self._grow(new_ids, new_years)
+
+        rows = self.ids.get_indexer(batch["customer_id"])
+        cols = np.searchsorted(self.years, batch["order_year"].to_numpy())
+        np.add.at(self.orders, (rows, cols), 1)
+        np.add.at(self.spend, (rows, cols), batch["amount"].to_numpy())
+        days = dates.astype(np.int64)
+        np.minimum.at(self.first_day, (rows, cols), days)
+        np.maximum.at(self.last_day, (rows, cols), days)
+
+        latest = (
+            pd.DataFrame({"row": rows, "order_date": dates})
+            .join(transactions[ATTRIBUTES].reset_index(drop=True))
+            .sort_values("order_date")
+            .drop_duplicates("row", keep="last")
+        )
+        self.attributes.loc[latest["row"].to_numpy(), ATTRIBUTES] = latest[ATTRIBUTES].to_numpy()
+        return self
+
+    def frame(self, years=None, as_of=None):
+        # Every per-customer figure, recency included, comes from the
+        # selected years only.
+        cols = slice(None) if years is None else np.isin(self.years, list(years))
+        orders = self.orders[:, cols].sum(axis=1)
+        active = orders > 0
+        orders = orders[active]
+        spend = self.spend[:, cols].sum(axis=1)[active]
+        first = self.first_day[:, cols].min(axis=1)[active].astype("datetime64[D]")
+        last = self.last_day[:, cols].max(axis=1)[active].astype("datetime64[D]")
+
+        if as_of is not None:
+            as_of = np.datetime64(as_of, "D")
+        elif len(last):
+            as_of = last.max()
+        else:
+            as_of = np.datetime64("NaT", "D")
+        recency = (as_of - last).astype("timedelta64[D]").astype(float)
+
+        df = pd.DataFrame({
+            "customer_id": self.ids[active],
+            "first_order": first,
+            "last_order": last,
+            "recency_days": recency,
+            "order_count": orders,
+            "lifetime_spend": spend,
+        })
+        df = pd.concat([df, self.attributes[active].reset_index(drop=True)], axis=1)
+
+        df["avg_order_value"] = df["lifetime_spend"] / df["order_count"]
+        df["customer_type"] = np.where(df["order_count"] == 1, "New", "Repeat")
+        df["r_score"] = _score(df["recency_days"].to_numpy(), ascending=False)
+        df["f_score"] = _frequency_score(df["order_count"].to_numpy())
+        df["m_score"] = _score(df["lifetime_spend"].to_numpy())
+        df["rfm_score"] = df["r_score"] * 100 + df["f_score"] * 10 + df["m_score"]
+        df["segment"] = _segment(df["r_score"].to_numpy(), df["f_score"].to_numpy(), df["order_count"].to_numpy())
+        return df
+
+    def query(self, years=None, tiers=None, states=None, prime=None, as_of=None):
+        df = self.frame(years, as_of)
+        if tiers is not None:
+            df = df[df["customer_tier"].isin(tiers)]
+        if states is not None:
+            df = df[df["customer_state"].isin(states)]
+        if prime is not None:
+            df = df[df["is_prime_member"] == prime]
+        return df
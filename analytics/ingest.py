@@ -0,0 +1,130 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+# Columns that still need cleaning (prices with currency symbols, free-text
+# ratings and delivery windows, yes/no flags) are read as strings and fixed
+# in the cleaning step; everything else gets its final type at parse time.
+RAW_SCHEMA = pa.schema([
+    ("transaction_id", pa.string()),
+    ("order_date", pa.string()),
+    ("customer_id", pa.string()),
+    ("product_id", pa.string()),
+    ("product_name", pa.string()),
+    ("category", pa.string()),
+    ("subcategory", pa.string()),
+    ("brand", pa.string()),
+    ("original_price_inr", pa.string()),
+    ("discount_percent", pa.float64()),
+    ("discounted_price_inr", pa.float64()),
+    ("quantity", pa.int32()),
+    ("subtotal_inr", pa.float64()),
+    ("delivery_charges", pa.float64()),
+    ("final_amount_inr", pa.float64()),
+    ("customer_city", pa.string()),
+    ("customer_state", pa.string()),
+    ("customer_tier", pa.string()),
+    ("customer_spending_tier", pa.string()),
+    ("customer_age_group", pa.string()),
+    ("payment_method", pa.string()),
+    ("delivery_days", pa.string()),
+    ("delivery_type", pa.string()),
+    ("is_prime_member", pa.string()),
+    ("is_festival_sale", pa.string()),
+    ("festival_name", pa.string()),
+    ("customer_rating", pa.string()),
+    ("return_status", pa.string()),
+    ("order_month", pa.int8()),
+    ("order_year", pa.int16()),
+    ("order_quarter", pa.int8()),
+    ("product_weight_kg", pa.float64()),
+    ("is_prime_eligible", pa.string()),
+    ("product_rating", pa.float64()),
+])
+YEARLY_FILE = re.compile(r"amazon_india_(\d{4})\.csv$")
+
+
+def _normalize_name(name):
+    return re.sub(r"\W+", "_", name.strip().lower()).strip("_")
+
+
+def read_yearly_file(path, schema=RAW_SCHEMA):
+    with open(path, newline="", encoding="utf-8") as f:
+        header = [_normalize_name(c) for c in next(csv.reader(f))]
+
+    table = pv.read_csv(
+        path,
+        read_options=pv.ReadOptions(column_names=header, skip_rows=1, use_threads=True),
+        convert_options=pv.ConvertOptions(
+            column_types=schema,
+            include_columns=schema.names,
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        ),
+    )
+    extra = sorted(set(header) - set(schema.names))
+    missing = sorted(set(schema.names) - set(header))
+    return table, extra, missing
+
+
+def ingest_file(path, out_dir):
+    started = time.perf_counter()
+    table, extra, missing = read_yearly_file(path)
+
+    # One Parquet file per year with the same schema, so the directory
+    # reads back as a single table with pq.read_table(out_dir).
+    name = os.path.splitext(os.path.basename(path))[0]
+    os.makedirs(out_dir, exist_ok=True)
+    pq.write_table(table, os.path.join(out_dir, f"{name}.parquet"))
+
+    return {
+        "file": os.path.basename(path),
+        "rows": table.num_rows,
+        "bytes": os.path.getsize(path),
+        "seconds": time.perf_counter() - started,
+        "extra_columns": extra,
+        "missing_columns": missing,
+    }
+
+
+def ingest(paths, out_dir, workers=None):
+    paths = [p for p in paths if YEARLY_FILE.search(os.path.basename(p))]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda p: ingest_file(p, out_dir), sorted(paths)))
+    elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read the yearly raw CSVs in parallel into a Parquet store.")
+    parser.add_argument("pattern", nargs="?", default=os.path.join("data", "raw", "amazon_india_*.csv"))
+    parser.add_argument("--out", default=os.path.join("data", "store", "raw"))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    results, elapsed = ingest(glob.glob(args.pattern), args.out, args.workers)
+
+    for r in results:
+        mb = r["bytes"] / 1e6
+        print(f"{r['file']:<28} {r['rows']:>10,} rows  {mb:8.1f} MB  {mb / r['seconds']:7.1f} MB/s")
+        if r["missing_columns"]:
+            print(f"    missing (filled with nulls): {', '.join(r['missing_columns'])}")
+        if r["extra_columns"]:
+            print(f"    not in schema (dropped): {', '.join(r['extra_columns'])}")
+
+    total_mb = sum(r["bytes"] for r in results) / 1e6
+    total_rows = sum(r["rows"] for r in results)
+    print(f"Total: {total_rows:,} rows, {total_mb:.1f} MB in {elapsed:.2f}s ({total_mb / elapsed:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
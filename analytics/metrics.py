@@ -0,0 +1,199 @@
+import pandas as pd
+
+from analytics.topk import top_k
+
+
+def executive_metrics(df):
+    yearly = df.groupby("order_year")["final_amount_inr"].sum().reset_index()
+    yearly["yoy_growth"] = yearly["final_amount_inr"].pct_change() * 100
+
+    monthly_revenue = df.groupby(["order_year", "order_month"])["final_amount_inr"].sum().reset_index()
+    monthly_revenue["year_month"] = monthly_revenue["order_year"].astype(str) + "-" + monthly_revenue["order_month"].astype(str)
+
+    # An empty filter or a single month has no month-on-month comparison.
+    months = monthly_revenue["final_amount_inr"]
+    current_revenue = months.iloc[-1] if len(months) >= 1 else 0.0
+    previous_revenue = months.iloc[-2] if len(months) >= 2 else float("nan")
+    mom_growth = (
+        (current_revenue - previous_revenue) / previous_revenue * 100
+        if previous_revenue > 0 else float("nan")
+    )
+
+    brand_revenue = df.groupby("brand")["final_amount_inr"].sum()
+    brand_share = (brand_revenue / brand_revenue.sum()) * 100
+
+    return {
+        "total_revenue": df["final_amount_inr"].sum(),
+        "latest_year_revenue": yearly["final_amount_inr"].iloc[-1] if len(yearly) else 0.0,
+        "active_customers": df["customer_id"].nunique(),
+        "total_orders": df["transaction_id"].count(),
+        "avg_order_value": df["final_amount_inr"].mean(),
+        "yearly": yearly,
+        "top_subcategories": top_k(df.groupby("subcategory")["final_amount_inr"].sum(), 10),
+        "monthly_revenue": monthly_revenue,
+        "current_month_revenue": current_revenue,
+        "previous_month_revenue": previous_revenue,
+        "mom_growth": mom_growth,
+        "top_brands": top_k(brand_share, 10),
+        "state_revenue": df.groupby("customer_state")["final_amount_inr"].sum(),
+        "city_revenue": top_k(df.groupby("customer_city")["final_amount_inr"].sum(), 10),
+        "return_rate": (df["return_status"] == "Returned").mean() * 100,
+        "avg_rating": df["customer_rating"].mean(),
+        "total_profit": df["profit"].sum(),
+        "avg_margin": df["profit_margin"].mean(),
+        "total_discount": (df["original_price_inr"] - df["discounted_price_inr"]).sum(),
+        "subcategory_revenue": df.groupby("subcategory")["final_amount_inr"].sum(),
+        "subcategory_margin": df.groupby("subcategory")["profit_margin"].mean(),
+        "customer_growth": df.groupby("order_year")["customer_id"].nunique(),
+        "product_growth": df.groupby("order_year")["product_id"].nunique(),
+        "prime_growth": df.groupby("order_year")["is_prime_member"].mean() * 100,
+        "festival_revenue": (
+            df[df["is_festival_sale"] == 1]
+            .groupby("festival_name")["final_amount_inr"]
+            .sum()
+        ),
+    }
+
+
+def revenue_metrics(df):
+    festival_df = df[df["is_festival_sale"] == 1]
+    sub_revenue = df.groupby("subcategory")["final_amount_inr"].sum().sort_values(ascending=False)
+
+    return {
+        "yearly_revenue": df.groupby("order_year")["final_amount_inr"].sum(),
+        "quarterly_revenue": df.groupby(["order_year", "order_quarter"])["final_amount_inr"].sum(),
+        "monthly_revenue": df.groupby(["order_year", "order_month"])["final_amount_inr"].sum(),
+        "subcategory_revenue": sub_revenue,
+        "subcategory_share": (sub_revenue / sub_revenue.sum()) * 100,
+        "subcategory_yearly": df.groupby(["order_year", "subcategory"])["final_amount_inr"].sum(),
+        "state_revenue": df.groupby("customer_state")["final_amount_inr"].sum().sort_values(ascending=False),
+        "top_cities": top_k(df.groupby("customer_city")["final_amount_inr"].sum(), 10),
+        "state_yearly": df.groupby(["order_year", "customer_state"])["final_amount_inr"].sum(),
+        "tier_yearly": df.groupby(["order_year", "customer_tier"])["final_amount_inr"].sum(),
+        "festival_revenue": festival_df["final_amount_inr"].sum(),
+        "festival_orders": festival_df["transaction_id"].count(),
+        "festival_customers": festival_df["customer_id"].nunique(),
+        "festival_revenue_by_name": (
+            festival_df.groupby("festival_name")["final_amount_inr"]
+            .sum()
+            .sort_values(ascending=False)
+        ),
+        "festival_yearly": festival_df.groupby("order_year")["final_amount_inr"].sum(),
+        "festival_monthly": festival_df.groupby("order_month")["final_amount_inr"].sum(),
+    }
+
+
+def customer_metrics(df):
+    total_customers = df["customer_id"].nunique()
+    total_revenue = df["final_amount_inr"].sum()
+    purchase_count = df.groupby("customer_id")["transaction_id"].count()
+    repeat_customers = (purchase_count > 1).sum()
+
+    return {
+        "total_customers": total_customers,
+        "total_revenue": total_revenue,
+        "avg_clv": df.groupby("customer_id")["final_amount_inr"].sum().mean(),
+        "retention_rate": (repeat_customers / total_customers) * 100 if total_customers > 0 else 0,
+        "customer_types": (
+            purchase_count.map(lambda x: "New" if x == 1 else "Repeat")
+            .value_counts()
+        ),
+        "purchase_frequency": purchase_count.value_counts().sort_index(),
+        "prime_revenue_share": df.groupby("is_prime_member")["final_amount_inr"].sum() / total_revenue * 100,
+        "prime_avg_spend": df.groupby("is_prime_member")["final_amount_inr"].mean(),
+        "yearly_customers": df.groupby("order_year")["customer_id"].nunique(),
+        "age_revenue": df.groupby("customer_age_group")["final_amount_inr"].sum(),
+        "tier_aov": df.groupby("customer_tier")["final_amount_inr"].mean(),
+        "state_revenue": df.groupby("customer_state")["final_amount_inr"].sum(),
+        "city_revenue": df.groupby("customer_city")["final_amount_inr"].mean(),
+    }
+
+
+def operations_metrics(df):
+    on_time = (df["delivery_days"] <= 5).astype(int)
+    payment_revenue = df.groupby("payment_method")["final_amount_inr"].sum()
+    total_revenue = df["final_amount_inr"].sum()
+
+    returned = df["return_status"] == "Returned"
+    return_df = df[returned]
+    rating_group = pd.cut(
+        df["product_rating"],
+        bins=[0, 2, 3, 4, 5],
+        labels=["Low (0-2)", "Medium (2-3)", "High (3-4)", "Very High (4-5)"]
+    )
+
+    return {
+        "avg_delivery_days": df["delivery_days"].mean(),
+        "on_time_rate": on_time.mean() * 100,
+        "fastest_delivery": df["delivery_days"].min(),
+        "slowest_delivery": df["delivery_days"].max(),
+        "on_time_counts": on_time.value_counts(),
+        "state_avg_delivery": df.groupby("customer_state")["delivery_days"].mean().sort_values(),
+        "state_on_time_rate": on_time.groupby(df["customer_state"]).mean() * 100,
+        "yearly_delivery": df.groupby("order_year")["delivery_days"].mean(),
+        "total_transactions": len(df),
+        "total_revenue": total_revenue,
+        "most_used_method": df["payment_method"].mode().iloc[0] if len(df) else None,
+        "payment_counts": df["payment_method"].value_counts(),
+        "payment_revenue": payment_revenue,
+        "payment_share": (payment_revenue / total_revenue) * 100,
+        "payment_trend": (
+            df.groupby(["order_year", "payment_method"])["final_amount_inr"]
+            .sum()
+            .unstack()
+        ),
+        "total_returns": len(return_df),
+        "return_rate": returned.mean() * 100 if len(df) > 0 else 0,
+        "revenue_lost": return_df["final_amount_inr"].sum(),
+        "returns_by_category": return_df.groupby("subcategory")["transaction_id"].count(),
+        "yearly_returns": return_df.groupby("order_year")["transaction_id"].count(),
+        "category_return_rate": returned.groupby(df["subcategory"]).mean() * 100,
+        "rating_group_return_rate": returned.groupby(rating_group, observed=False).mean() * 100,
+    }
+
+
+def product_metrics(df):
+    product_summary = df.groupby("product_name").agg({
+        "final_amount_inr": "sum",
+        "quantity": "sum",
+        "product_rating": "mean",
+        "return_status": lambda x: (x == "Returned").mean() * 100
+    })
+    brand_rev = df.groupby("brand")["final_amount_inr"].sum().sort_values(ascending=False)
+
+    launch_df = df[df["order_year"] == df["launch_year"]]
+
+    return {
+        "product_summary": product_summary,
+        "top_products": product_summary.loc[top_k(product_summary["final_amount_inr"], 20).index],
+        "subcategory_revenue": df.groupby("subcategory")["final_amount_inr"].sum(),
+        "brand_units": df.groupby("brand")["quantity"].sum(),
+        "brand_revenue": brand_rev,
+        "brand_share": (brand_rev / df["final_amount_inr"].sum()) * 100,
+        "brand_yearly": df.groupby(["order_year", "brand"])["final_amount_inr"].sum(),
+        "customer_preference": df.groupby("subcategory")["customer_id"].count(),
+        "monthly_demand": df.groupby("order_month")["quantity"].sum(),
+        "seasonal_revenue": df.groupby("order_quarter")["final_amount_inr"].sum(),
+        "yearly_quantity": df.groupby("order_year")["quantity"].sum(),
+        "avg_rating": df["product_rating"].mean(),
+        "total_reviews": df["product_rating"].count(),
+        "rating_revenue": df.groupby("product_rating")["final_amount_inr"].sum(),
+        "rating_return_rate": (df["return_status"] == "Returned").groupby(df["product_rating"]).mean() * 100,
+        "launch_summary": launch_df.groupby("launch_year").agg(
+            launch_revenue=("final_amount_inr", "sum"),
+            products_launched=("product_id", "nunique"),
+            avg_launch_rating=("product_rating", "mean"),
+            launch_return_rate=("is_returned", "mean"),
+        ),
+        "launch_product_revenue": launch_df.groupby(["launch_year", "product_name"])["final_amount_inr"].sum(),
+        "launch_category_revenue": launch_df.groupby(["launch_year", "subcategory"])["final_amount_inr"].sum(),
+    }
+
+
+SECTIONS = {
+    "executive": executive_metrics,
+    "revenue": revenue_metrics,
+    "customers": customer_metrics,
+    "operations": operations_metrics,
+    "products": product_metrics,
+}
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+PRICING_COLUMNS = [
+    "original_price_inr",
+    "discount_percent",
+    "discounted_price_inr",
+    "quantity",
+    "final_amount_inr",
+]
+MOMENT_COLUMNS = PRICING_COLUMNS + ["delivery_days", "customer_rating", "product_rating", "is_returned"]
+
+
+def _factorize(frame, dims):
+    grouped = frame.groupby(dims, sort=False, dropna=False)
+    return grouped.ngroup().to_numpy(), grouped.size().index.to_frame(index=False)
+
+
+def _reduce(codes, groups, n, mean, m2, cxy):
+    # Chan et al. pairwise combination of per-cell count / mean / centred
+    # second moments. Every statistic is kept per column pair, over the
+    # rows where both columns are present, which matches pandas' corr().
+    total_n = np.zeros((groups,) + n.shape[1:])
+    np.add.at(total_n, codes, n)
+    total_mean = np.zeros_like(total_n)
+    np.add.at(total_mean, codes, n * mean)
+    total_mean = np.divide(total_mean, total_n, out=np.zeros_like(total_n), where=total_n > 0)
+
+    delta = mean - total_mean[codes]
+    delta_t = delta.transpose(0, 2, 1)
+    total_m2 = np.zeros_like(total_n)
+    np.add.at(total_m2, codes, m2 + n * delta ** 2)
+    total_cxy = np.zeros_like(total_n)
+    np.add.at(total_cxy, codes, cxy + n * delta * delta_t)
+    return total_n, total_mean, total_m2, total_cxy
+
+
+class MomentCube:
+    def __init__(self, df, dims=("subcategory", "order_year"), columns=MOMENT_COLUMNS):
+        self.dims = list(dims)
+        self.columns = list(columns)
+        if df is None:
+            return
+
+        codes, self.cells = _factorize(df, self.dims)
+        groups = len(self.cells)
+        p = len(self.columns)
+
+        x = df[self.columns].to_numpy(dtype=float)
+        valid = ~np.isnan(x)
+        shape = (groups, p, p)
+        self.n = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.cxy = np.zeros(shape)
+
+        for i in range(p):
+            for j in range(i, p):
+                w = valid[:, i] & valid[:, j]
+                n = np.bincount(codes, w, minlength=groups)
+                safe_n = np.where(n > 0, n, 1)
+                xi = np.where(w, x[:, i], 0.0)
+                xj = np.where(w, x[:, j], 0.0)
+                mi = np.bincount(codes, xi, minlength=groups) / safe_n
+                mj = np.bincount(codes, xj, minlength=groups) / safe_n
+                di = np.where(w, xi - mi[codes], 0.0)
+                dj = np.where(w, xj - mj[codes], 0.0)
+
+                self.n[:, i, j] = self.n[:, j, i] = n
+                self.mean[:, i, j] = mi
+                self.mean[:, j, i] = mj
+                self.m2[:, i, j] = np.bincount(codes, di * di, minlength=groups)
+                self.m2[:, j, i] = np.bincount(codes, dj * dj, minlength=groups)
+                self.cxy[:, i, j] = self.cxy[:, j, i] = np.bincount(codes, di * dj, minlength=groups)
+
+    def merge(self, other):
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        merged = MomentCube(None, self.dims, self.columns)
+        codes, merged.cells = _factorize(cells, self.dims)
+        merged.n, merged.mean, merged.m2, merged.cxy = _reduce(
+            codes,
+            len(merged.cells),
+            np.concatenate([self.n, other.n]),
+            np.concatenate([self.mean, other.mean]),
+            np.concatenate([self.m2, other.m2]),
+            np.concatenate([self.cxy, other.cxy]),
+        )
+        return merged
+
+    def select(self, **filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, values in filters.items():
+            mask &= self.cells[dim].isin(values).to_numpy()
+        return mask
+
+    def totals(self, **filters):
+        mask = self.select(**filters)
+        codes = np.zeros(mask.sum(), dtype=int)
+        n, mean, m2, cxy = _reduce(codes, 1, self.n[mask], self.mean[mask], self.m2[mask], self.cxy[mask])
+        return n[0], mean[0], m2[0], cxy[0]
+
+    def summary(self, column, by=None, **filters):
+        # Count, mean and sum of one column over the selected cells, in total
+        # or per value of one dimension.
+        mask = self.select(**filters)
+        if by is None:
+            codes, labels = np.zeros(mask.sum(), dtype=int), pd.Index(["all"])
+        else:
+            codes, labels = pd.factorize(self.cells.loc[mask, by], sort=True, use_na_sentinel=False)
+        n, mean, _, _ = _reduce(codes, len(labels), self.n[mask], self.mean[mask], self.m2[mask], self.cxy[mask])
+        i = self.columns.index(column)
+        count, mean = n[:, i, i], np.where(n[:, i, i] > 0, mean[:, i, i], np.nan)
+        return pd.DataFrame(
+            {"count": count, "mean": mean, "sum": np.nan_to_num(count * mean)},
+            index=pd.Index(labels, name=by),
+        )
+
+    def corr(self, columns=None, **filters):
+        n, mean, m2, cxy = self.totals(**filters)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cxy / np.sqrt(m2 * m2.T)
+        corr[n < 2] = np.nan
+        result = pd.DataFrame(corr, index=self.columns, columns=self.columns)
+        if columns is not None:
+            result = result.loc[columns, columns]
+        return result
+
+    def regression(self, x, y, **filters):
+        n, mean, m2, cxy = self.totals(**filters)
+        i, j = self.columns.index(x), self.columns.index(y)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = cxy[i, j] / m2[i, j]
+            r2 = cxy[i, j] ** 2 / (m2[i, j] * m2[j, i])
+        return {
+            "n": int(n[i, j]),
+            "slope": slope,
+            "intercept": mean[j, i] - slope * mean[i, j],
+            "r2": r2,
+        }
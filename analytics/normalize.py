@@ -0,0 +1,224 @@
+import argparse
+import os
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+import pandas as pd
+
+CITY_ALIASES = {
+    "bangalore": ["banglore", "bengalore", "bengaluru"],
+    "mumbai": ["mumba", "bombay"],
+    "chennai": ["chenai", "madras"],
+    "delhi": ["new delhi", "delhi ncr"],
+    "kolkata": ["calcutta"],
+    "hyderabad": ["secunderabad"],
+    "pune": ["poona"],
+    "ahmedabad": ["amdavad"],
+    "jaipur": [],
+    "lucknow": [],
+    "kochi": ["cochin"],
+    "chandigarh": [],
+    "indore": [],
+    "bhopal": [],
+    "coimbatore": [],
+    "nagpur": [],
+    "surat": [],
+    "patna": [],
+    "visakhapatnam": ["vizag"],
+    "vadodara": ["baroda"],
+    "gurgaon": ["gurugram"],
+    "noida": [],
+    "thiruvananthapuram": ["trivandrum"],
+    "mysore": ["mysuru"],
+    "allahabad": ["prayagraj"],
+    "ludhiana": [],
+    "bhubaneswar": [],
+    "gorakhpur": [],
+    "kanpur": [],
+    "aligarh": [],
+    "meerut": [],
+    "saharanpur": [],
+    "bareilly": [],
+    "moradabad": [],
+    "varanasi": ["benares", "banaras"],
+}
+CATEGORY_ALIASES = {
+    "electronics": ["electronics & accessories", "electronic", "electronicss"],
+}
+MAPPING_COLUMNS = ["raw", "canonical", "method", "score", "suggested"]
+
+
+def clean(value):
+    return re.sub(r"\s+", " ", str(value).lower()).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def edit_budget(length):
+    # Edits a fuzzy match may differ by: none for short names, where one
+    # edit is often another word, one from 5 characters and two from 8.
+    return 0 if length < 5 else 1 if length < 8 else 2
+
+
+class Normalizer:
+    # A cleaned value within the edit budget of a known name is applied as a
+    # fuzzy match only when it is a rare variant: seen at most 1/`rare_ratio`
+    # as often as that name's canonical. Close matches that are not rare, or
+    # one edit beyond the budget, keep the cleaned value and are written to
+    # the mapping as "review" with the suggested name, so close but distinct
+    # cities (raipur / jaipur) are never merged unseen.
+    def __init__(self, aliases, rare_ratio=10, min_share=0.001, candidates=5):
+        self.rare_ratio = rare_ratio
+        self.min_share = min_share
+        self.candidates = candidates
+        self.names = []
+        self.canonical = []
+        self.exact = {}
+        self.index = defaultdict(list)
+        for canonical, names in aliases.items():
+            for name in [canonical, *names]:
+                self._add(clean(name), canonical)
+
+        self.counts = Counter()
+        self.volume = Counter()
+        self.decisions = {}
+
+    def _add(self, name, canonical):
+        for gram in trigrams(name):
+            self.index[gram].append(len(self.names))
+        self.names.append(name)
+        self.canonical.append(canonical)
+        self.exact[name] = canonical
+
+    def _closest(self, text):
+        # (name, canonical, edit distance) of the nearest trigram candidate.
+        hits = Counter(i for gram in trigrams(text) for i in self.index.get(gram, ()))
+        best = (None, None, float("inf"))
+        for i, _ in hits.most_common(self.candidates):
+            distance = edit_distance(text, self.names[i])
+            if distance < best[2]:
+                best = (self.names[i], self.canonical[i], distance)
+        return best
+
+    def _budget(self, text, name):
+        return edit_budget(min(len(text), len(name))) if name else -1
+
+    def observe(self, values, counts=None):
+        # Record how often each cleaned value occurs. Frequent values that are
+        # not within review distance of any known name become canonical names
+        # themselves, so a city missing from the alias table resolves to
+        # itself rather than a neighbour; rare far-off values stay unmatched.
+        counts = np.ones(len(values), dtype=np.int64) if counts is None else counts
+        for value, count in zip(values, counts):
+            self.counts[clean(value)] += int(count)
+
+        total = sum(self.counts.values())
+        for text, count in self.counts.most_common():
+            if text in self.exact or count < self.min_share * total:
+                continue
+            name, _, distance = self._closest(text)
+            if distance > self._budget(text, name) + 1:
+                self._add(text, text)
+
+        self.volume = Counter()
+        for text, count in self.counts.items():
+            if text in self.exact:
+                self.volume[self.exact[text]] += count
+        return self
+
+    def resolve(self, value):
+        if value in self.decisions:
+            return self.decisions[value]
+
+        text = clean(value)
+        if text in self.exact:
+            decision = (self.exact[text], "exact", 1.0, "")
+        else:
+            name, canonical, distance = self._closest(text)
+            score = 1 - distance / max(len(text), len(name)) if name else 0.0
+            budget = self._budget(text, name)
+            rare = self.counts[text] * self.rare_ratio <= self.volume[canonical] and self.volume[canonical] > 0
+            if distance <= budget and rare:
+                decision = (canonical, "fuzzy", score, canonical)
+            elif distance <= budget + 1:
+                decision = (text, "review", score, canonical)
+            else:
+                decision = (text, "unmatched", score, "")
+
+        self.decisions[value] = decision
+        return decision
+
+    def normalize(self, values):
+        # Each distinct raw value is resolved once; rows are mapped by code.
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.observe(uniques, counts)
+        resolved = pd.Index([self.resolve(v)[0] for v in uniques], dtype=object)
+        result = pd.Series(resolved.take(codes), index=values.index, name=values.name)
+        return result.where(codes >= 0)
+
+    def load_mapping(self, path):
+        if os.path.exists(path):
+            mapping = pd.read_csv(path, keep_default_na=False).reindex(columns=MAPPING_COLUMNS, fill_value="")
+            for row in mapping.itertuples(index=False):
+                self.decisions[row.raw] = (row.canonical, row.method, float(row.score), row.suggested)
+        return self
+
+    def save_mapping(self, path):
+        rows = [(raw, *decision) for raw, decision in self.decisions.items()]
+        mapping = pd.DataFrame(rows, columns=MAPPING_COLUMNS).sort_values(["method", "raw"])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        mapping.to_csv(path, index=False)
+        return mapping
+
+
+def city_normalizer(mapping_path=None):
+    normalizer = Normalizer(CITY_ALIASES)
+    return normalizer.load_mapping(mapping_path) if mapping_path else normalizer
+
+
+def category_normalizer(mapping_path=None):
+    normalizer = Normalizer(CATEGORY_ALIASES)
+    return normalizer.load_mapping(mapping_path) if mapping_path else normalizer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve raw city or category values to canonical names.")
+    parser.add_argument("csv")
+    parser.add_argument("--column", default="customer_city")
+    parser.add_argument("--kind", choices=["city", "category"], default="city")
+    parser.add_argument("--mapping", help="reviewable mapping file, read and updated in place")
+    parser.add_argument("--out", help="write the CSV with the column normalized")
+    args = parser.parse_args(argv)
+
+    factory = city_normalizer if args.kind == "city" else category_normalizer
+    mapping = args.mapping or os.path.join("mappings", f"{args.kind}_mapping.csv")
+    normalizer = factory(mapping)
+
+    df = pd.read_csv(args.csv, dtype={args.column: str})
+    df[args.column] = normalizer.normalize(df[args.column])
+    decisions = normalizer.save_mapping(mapping)
+    print(decisions["method"].value_counts().to_string())
+
+    if args.out:
+        df.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
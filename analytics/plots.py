@@ -0,0 +1,13 @@
+def pyplot():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def seaborn():
+    import seaborn as sns
+
+    return sns
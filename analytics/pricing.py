@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from analytics.data import UNIT_COST_RATIO
+
+PRICING_DIMS = ("subcategory", "brand")
+BUCKETS = 100
+MAX_DISCOUNT = 90
+
+
+def _fit(codes, x, y, groups, shrinkage):
+    # Per-group least squares of log(quantity) on log(price / list price).
+    # Groups with little price variation are shrunk towards the pooled
+    # slope, weighted by how much variation they do have.
+    n = np.bincount(codes, minlength=groups)
+    safe_n = np.where(n > 0, n, 1)
+    mx = np.bincount(codes, x, minlength=groups) / safe_n
+    my = np.bincount(codes, y, minlength=groups) / safe_n
+    dx = x - mx[codes]
+    sxx = np.bincount(codes, dx * dx, minlength=groups)
+    sxy = np.bincount(codes, dx * (y - my[codes]), minlength=groups)
+
+    px = x - x.mean()
+    pooled_sxx = (px * px).sum()
+    pooled = (px * (y - y.mean())).sum() / pooled_sxx if pooled_sxx > 0 else 0.0
+
+    raw = np.divide(sxy, sxx, out=np.full(groups, np.nan), where=sxx > 0)
+    weight = sxx / (sxx + shrinkage * pooled_sxx / max(len(x), 1))
+    elasticity = np.where(sxx > 0, weight * np.nan_to_num(raw) + (1 - weight) * pooled, pooled)
+    # Demand is not allowed to rise with price.
+    return n, raw, np.minimum(elasticity, 0.0)
+
+
+class PricingModel:
+    def __init__(self, df, dims=PRICING_DIMS, shrinkage=50):
+        self.dims = list(dims)
+        discount = df["discount_percent"].to_numpy(dtype=float)
+        quantity = df["quantity"].to_numpy(dtype=float)
+        original = df["original_price_inr"].to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            valid = (discount >= 0) & (discount < BUCKETS) & (quantity > 0) & (original > 0)
+
+        discount, quantity, original = discount[valid], quantity[valid], original[valid]
+        bucket = np.rint(discount).astype(np.int64).clip(0, BUCKETS - 1)
+        x = np.log1p(-discount / 100)
+        y = np.log(quantity)
+        years = df["order_year"].to_numpy()[valid]
+        self.years = np.unique(years)
+        year_codes = np.searchsorted(self.years, years)
+
+        self.elasticities = {}
+        self.baselines = {}
+        for dim in self.dims:
+            codes, groups = pd.factorize(df[dim].to_numpy()[valid])
+            keep = codes >= 0
+            c = codes[keep]
+            g = len(groups)
+
+            n, raw, elasticity = _fit(c, x[keep], y[keep], g, shrinkage)
+            self.elasticities[dim] = pd.DataFrame(
+                {"n": n, "raw_elasticity": raw, "elasticity": elasticity}, index=pd.Index(groups, name=dim)
+            )
+
+            # List-price value and units per (year, group, discount %), the
+            # only state the simulator needs.
+            flat = (year_codes[keep] * g + c) * BUCKETS + bucket[keep]
+            size = len(self.years) * g * BUCKETS
+            shape = (len(self.years), g, BUCKETS)
+            list_value = np.bincount(flat, original[keep] * quantity[keep], minlength=size).reshape(shape)
+            units = np.bincount(flat, quantity[keep], minlength=size).reshape(shape)
+            self.baselines[dim] = (list_value, units)
+
+    def fits(self, dim):
+        return self.elasticities[dim]
+
+    def baseline_years(self):
+        return self.years.tolist()
+
+    def simulate(self, dim, extra_discount, groups=None, years=None):
+        # Every historical discount level moves by each extra_discount (in
+        # percentage points) and its units scale by (new / old price) **
+        # elasticity; all scenarios x groups x levels in one array.
+        list_value, units = self.baselines[dim]
+        fits = self.elasticities[dim]
+
+        if years is not None:
+            ymask = np.isin(self.years, list(years))
+            list_value, units = list_value[ymask], units[ymask]
+        value = list_value.sum(axis=0)
+        qty = units.sum(axis=0)
+
+        labels = fits.index
+        elasticity = fits["elasticity"].to_numpy()
+        if groups is not None:
+            gmask = labels.isin(list(groups))
+            value, qty, labels, elasticity = value[gmask], qty[gmask], labels[gmask], elasticity[gmask]
+
+        deltas = np.atleast_1d(np.asarray(extra_discount, dtype=float))
+        d0 = np.arange(BUCKETS, dtype=float)
+        r0 = 1 - d0 / 100
+        d1 = np.clip(d0[None, :] + deltas[:, None], 0, np.maximum(d0, MAX_DISCOUNT))
+        r1 = 1 - d1 / 100
+
+        factor = (r1 / r0)[:, None, :] ** elasticity[None, :, None]
+        new_units = np.einsum("gb,dgb->dg", qty, factor)
+        new_value = np.einsum("gb,dgb->dg", value, factor)
+        revenue = np.einsum("gb,db,dgb->dg", value, r1, factor)
+        baseline = value @ r0
+
+        d, g = len(deltas), len(labels)
+        baseline = np.broadcast_to(baseline, (d, g))
+        change = np.divide(revenue - baseline, baseline, out=np.full((d, g), np.nan), where=baseline > 0)
+        return pd.DataFrame({
+            "extra_discount": np.repeat(deltas, g),
+            dim: np.tile(labels.to_numpy(), d),
+            "units": new_units.ravel(),
+            "revenue": revenue.ravel(),
+            "profit": (revenue - UNIT_COST_RATIO * new_value).ravel(),
+            "baseline_revenue": baseline.ravel(),
+            "revenue_change_pct": change.ravel() * 100,
+        })
+
+    def curve(self, dim, extra_discount, groups=None, years=None):
+        totals = (
+            self.simulate(dim, extra_discount, groups, years)
+            .groupby("extra_discount")[["units", "revenue", "profit", "baseline_revenue"]]
+            .sum()
+        )
+        totals["revenue_change_pct"] = (totals["revenue"] / totals["baseline_revenue"] - 1) * 100
+        return totals
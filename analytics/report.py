@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from analytics.data import create_db_engine, read_dataset
+from analytics.metrics import SECTIONS
+
+_worker_df = None
+
+
+def _init_worker(df):
+    global _worker_df
+    _worker_df = df
+
+
+def _run_section(name):
+    return name, SECTIONS[name](_worker_df)
+
+
+def _to_frame(value):
+    if isinstance(value, pd.Series):
+        value = value.to_frame(value.name if value.name is not None else "value")
+    value = value.reset_index()
+    value.columns = [str(c) for c in value.columns]
+    return value
+
+
+def _to_scalar(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_section(out_dir, name, result):
+    section_dir = os.path.join(out_dir, name)
+    os.makedirs(section_dir, exist_ok=True)
+
+    kpis = {}
+    for key, value in result.items():
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            _to_frame(value).to_parquet(os.path.join(section_dir, f"{key}.parquet"), index=False)
+        else:
+            kpis[key] = _to_scalar(value)
+
+    with open(os.path.join(section_dir, "kpis.json"), "w") as f:
+        json.dump(kpis, f, indent=2, default=str)
+
+    return kpis
+
+
+def build_report(df, out_dir, sections=None, workers=None):
+    sections = sections or list(SECTIONS)
+    os.makedirs(out_dir, exist_ok=True)
+
+    summary = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as pool:
+        for name, result in pool.map(_run_section, sections):
+            summary[name] = write_section(out_dir, name, result)
+
+    with open(os.path.join(out_dir, "kpis.json"), "w") as f:
+        json.dump(summary, f, indent=2, default=str)
+
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write dashboard KPI snapshots without Streamlit.")
+    parser.add_argument("--out", default=os.path.join("reports", datetime.now().strftime("%Y-%m-%d")))
+    parser.add_argument("--section", action="append", choices=sorted(SECTIONS), dest="sections")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    df = read_dataset(create_db_engine())
+    build_report(df, args.out, args.sections, args.workers)
+    print(f"Wrote {len(args.sections or SECTIONS)} sections to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
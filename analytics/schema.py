@@ -0,0 +1,376 @@
+import argparse
+import sys
+
+import pandas as pd
+from sqlalchemy import text
+
+from analytics.data import create_db_engine
+
+# Column types match what the dashboards read today: floats stay DOUBLE so
+# pandas gets float64 rather than Decimal objects, flags stay BOOLEAN
+# (TINYINT) as written by to_sql.
+TABLES = {
+    "customers": {
+        "columns": [
+            ("customer_id", "VARCHAR(32) NOT NULL"),
+            ("customer_city", "VARCHAR(64)"),
+            ("customer_state", "VARCHAR(64)"),
+            ("customer_tier", "VARCHAR(16)"),
+            ("customer_spending_tier", "VARCHAR(16)"),
+            ("customer_age_group", "VARCHAR(16)"),
+            ("is_prime_member", "BOOLEAN"),
+        ],
+        "primary_key": ["customer_id"],
+    },
+    "products": {
+        "columns": [
+            ("product_id", "VARCHAR(32) NOT NULL"),
+            ("product_name", "VARCHAR(255)"),
+            ("category", "VARCHAR(64)"),
+            ("subcategory", "VARCHAR(64)"),
+            ("brand", "VARCHAR(64)"),
+            ("product_weight_kg", "DOUBLE"),
+            ("product_rating", "DOUBLE"),
+            ("is_prime_eligible", "BOOLEAN"),
+        ],
+        "primary_key": ["product_id"],
+    },
+    "time_dimension": {
+        "columns": [
+            ("order_date", "DATE NOT NULL"),
+            ("order_month", "TINYINT"),
+            ("order_year", "SMALLINT"),
+            ("order_quarter", "TINYINT"),
+        ],
+        "primary_key": ["order_date"],
+    },
+    "transactions": {
+        "columns": [
+            ("transaction_id", "VARCHAR(32) NOT NULL"),
+            ("customer_id", "VARCHAR(32) NOT NULL"),
+            ("product_id", "VARCHAR(32) NOT NULL"),
+            ("order_date", "DATE NOT NULL"),
+            ("quantity", "INT"),
+            ("original_price_inr", "DOUBLE"),
+            ("discount_percent", "DOUBLE"),
+            ("discounted_price_inr", "DOUBLE"),
+            ("subtotal_inr", "DOUBLE"),
+            ("delivery_charges", "DOUBLE"),
+            ("final_amount_inr", "DOUBLE"),
+            ("payment_method", "VARCHAR(32)"),
+            ("delivery_days", "DOUBLE"),
+            ("delivery_type", "VARCHAR(32)"),
+            ("is_festival_sale", "BOOLEAN"),
+            ("festival_name", "VARCHAR(64)"),
+            ("customer_rating", "DOUBLE"),
+            ("return_status", "VARCHAR(16)"),
+        ],
+        # MySQL requires the partitioning column in every unique key, so
+        # order_date is part of the primary key.
+        "primary_key": ["transaction_id", "order_date"],
+    },
+}
+INDEXES = {
+    "customers": [("idx_customers_state_tier", ["customer_state", "customer_tier"])],
+    "products": [("idx_products_subcategory_brand", ["subcategory", "brand"])],
+    "time_dimension": [("idx_time_year_month", ["order_year", "order_month"])],
+    "transactions": [
+        ("idx_tx_customer", ["customer_id", "order_date"]),
+        ("idx_tx_product", ["product_id", "order_date"]),
+        ("idx_tx_date", ["order_date"]),
+    ],
+}
+DEFAULT_YEARS = (2015, 2025)
+
+# Queries in the shape the dashboards and services issue, with the access
+# path each table is expected to use.
+DASHBOARD_QUERIES = {
+    "data_version": (
+        "select count(*), max(order_date) from transactions",
+        {},
+        {"transactions": {"key": "idx_tx_date"}},
+    ),
+    "customer_history": (
+        "select t.order_date, t.final_amount_inr, p.brand from transactions t "
+        "join products p on p.product_id = t.product_id where t.customer_id = :customer_id",
+        {"customer_id": "CUST_2024_00000001"},
+        {"t": {"key": "idx_tx_customer"}, "p": {"key": "PRIMARY"}},
+    ),
+    "product_sales": (
+        "select order_date, quantity, final_amount_inr from transactions "
+        "where product_id = :product_id and order_date >= :start",
+        {"product_id": "PROD_000001", "start": "2024-01-01"},
+        {"transactions": {"key": "idx_tx_product"}},
+    ),
+    "state_revenue_for_year": (
+        "select c.customer_state, sum(t.final_amount_inr) from transactions t "
+        "join customers c on c.customer_id = t.customer_id "
+        "where t.order_date >= :start and t.order_date < :end group by c.customer_state",
+        {"start": "2024-01-01", "end": "2025-01-01"},
+        {"t": {"partitions": "p2024"}, "c": {"key": "PRIMARY"}},
+    ),
+    "monthly_trend": (
+        "select d.order_year, d.order_month, sum(t.final_amount_inr) from transactions t "
+        "join time_dimension d on d.order_date = t.order_date group by d.order_year, d.order_month",
+        {},
+        {"d": {"key": "PRIMARY"}},
+    ),
+    "customer_segment": (
+        "select customer_id from customers where customer_state = :state and customer_tier = :tier",
+        {"state": "Maharashtra", "tier": "Metro"},
+        {"customers": {"key": "idx_customers_state_tier"}},
+    ),
+}
+
+
+def create_statement(table, name=None):
+    spec = TABLES[table]
+    lines = [f"{column} {kind}" for column, kind in spec["columns"]]
+    lines.append(f"PRIMARY KEY ({', '.join(spec['primary_key'])})")
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE {name or table} (\n    {body}\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+
+
+def partition_clause(first_year, last_year):
+    parts = [f"PARTITION p{y} VALUES LESS THAN ({y + 1})" for y in range(first_year, last_year + 1)]
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (YEAR(order_date)) (\n    " + ",\n    ".join(parts) + "\n)"
+
+
+def _exists(conn, table):
+    return conn.execute(
+        text(
+            "select count(*) from information_schema.tables "
+            "where table_schema = database() and table_name = :table"
+        ),
+        {"table": table},
+    ).scalar() > 0
+
+
+def _partitions(conn, table):
+    return conn.execute(
+        text(
+            "select partition_name from information_schema.partitions "
+            "where table_schema = database() and table_name = :table and partition_name is not null "
+            "order by partition_ordinal_position"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+
+def _has_primary_key(conn, table):
+    return conn.execute(
+        text(
+            "select count(*) from information_schema.table_constraints "
+            "where table_schema = database() and table_name = :table and constraint_type = 'PRIMARY KEY'"
+        ),
+        {"table": table},
+    ).scalar() > 0
+
+
+def _indexes(conn, table):
+    return set(conn.execute(
+        text(
+            "select distinct index_name from information_schema.statistics "
+            "where table_schema = database() and table_name = :table"
+        ),
+        {"table": table},
+    ).scalars())
+
+
+def create_keyed_tables(conn):
+    # Tables left by to_sql have TEXT columns, no keys and, for customers,
+    # duplicate rows from repeated appends. They are copied into a keyed
+    # table and swapped in with one RENAME; the original is kept as
+    # <table>_legacy. Strict mode makes a value that does not fit its
+    # column fail the copy instead of being truncated, and only customers
+    # are deduplicated: a duplicate key anywhere else fails the copy too.
+    conn.execute(text("SET SESSION sql_mode = CONCAT_WS(',', @@SESSION.sql_mode, 'STRICT_ALL_TABLES')"))
+    notes = []
+    for table, spec in TABLES.items():
+        if not _exists(conn, table):
+            conn.execute(text(create_statement(table)))
+            continue
+        if _has_primary_key(conn, table):
+            continue
+        columns = ", ".join(column for column, _ in spec["columns"])
+        source = table
+        if table == "customers":
+            key = ", ".join(spec["primary_key"])
+            source = (
+                f"(SELECT {columns}, ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY {key}) AS row_rank "
+                f"FROM {table}) ranked WHERE row_rank = 1"
+            )
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}_new"))
+        conn.execute(text(create_statement(table, f"{table}_new")))
+        copied = conn.execute(text(f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {source}")).rowcount
+        total = conn.execute(text(f"select count(*) from {table}")).scalar()
+        if total > copied:
+            notes.append(f"{table}: dropped {total - copied} duplicate rows")
+        conn.execute(text(f"RENAME TABLE {table} TO {table}_legacy, {table}_new TO {table}"))
+    return notes
+
+
+def add_secondary_indexes(conn):
+    for table, indexes in INDEXES.items():
+        existing = _indexes(conn, table)
+        adds = ", ".join(
+            f"ADD INDEX {name} ({', '.join(columns)})" for name, columns in indexes if name not in existing
+        )
+        if adds:
+            conn.execute(text(f"ALTER TABLE {table} {adds}"))
+
+
+def partition_transactions(conn):
+    if _partitions(conn, "transactions"):
+        return
+    first, last = conn.execute(
+        text("select min(year(order_date)), max(year(order_date)) from transactions")
+    ).one()
+    first = first or DEFAULT_YEARS[0]
+    last = last or DEFAULT_YEARS[1]
+    conn.execute(text(f"ALTER TABLE transactions {partition_clause(first, last)}"))
+
+
+VERSIONED_TABLES = ["products", "customers", "time_dimension"]
+
+
+def _triggers(conn):
+    return set(conn.execute(
+        text("select trigger_name from information_schema.triggers where trigger_schema = database()")
+    ).scalars())
+
+
+def add_version_marker(conn):
+    # A one-row counter that every write to a dimension table bumps, so
+    # analytics.data.read_data_version reads a primary key instead of
+    # checksumming the tables. Transactions are left out: appends already
+    # change their row count, and a row trigger would slow bulk loads.
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS data_version ("
+        "id TINYINT NOT NULL PRIMARY KEY, version BIGINT NOT NULL DEFAULT 0, "
+        "updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6))"
+    ))
+    conn.execute(text("INSERT IGNORE INTO data_version (id, version) VALUES (1, 0)"))
+    existing = _triggers(conn)
+    for table in VERSIONED_TABLES:
+        if not _exists(conn, table):
+            continue
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            name = f"{table}_{event.lower()}_version"
+            if name not in existing:
+                conn.execute(text(
+                    f"CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW "
+                    "UPDATE data_version SET version = version + 1 WHERE id = 1"
+                ))
+
+
+MIGRATIONS = [
+    (1, "keyed tables with typed columns", create_keyed_tables),
+    (2, "secondary indexes for dashboard queries", add_secondary_indexes),
+    (3, "range partitions on transactions by order year", partition_transactions),
+    (4, "data version marker bumped by dimension table triggers", add_version_marker),
+]
+
+
+def ensure_partitions(conn, through_year):
+    # Splits a named partition off pmax for every year up to through_year, so
+    # new orders never land in the catch-all partition.
+    existing = [p for p in _partitions(conn, "transactions") if p != "pmax"]
+    if not existing:
+        return []
+    added = []
+    for year in range(int(existing[-1][1:]) + 1, through_year + 1):
+        conn.execute(text(
+            "ALTER TABLE transactions REORGANIZE PARTITION pmax INTO ("
+            f"PARTITION p{year} VALUES LESS THAN ({year + 1}), "
+            "PARTITION pmax VALUES LESS THAN MAXVALUE)"
+        ))
+        added.append(f"p{year}")
+    return added
+
+
+def migrate(engine, through_year=None):
+    # MySQL commits DDL implicitly, so a step cannot be rolled back. Each
+    # step skips whatever is already in place and is recorded as soon as it
+    # finishes, so a rerun after a failure resumes at the failed step.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INT NOT NULL PRIMARY KEY, description VARCHAR(255), "
+            "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        applied = set(conn.execute(text("select version from schema_migrations")).scalars())
+
+    done = []
+    for version, description, step in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            notes = step(conn)
+            conn.execute(
+                text("insert into schema_migrations (version, description) values (:v, :d)"),
+                {"v": version, "d": description},
+            )
+        done += [description, *(notes or [])]
+
+    with engine.begin() as conn:
+        if through_year is None:
+            through_year = conn.execute(text("select year(max(order_date)) + 1 from transactions")).scalar()
+        if through_year:
+            done += [f"partition {p}" for p in ensure_partitions(conn, int(through_year))]
+    return done
+
+
+def explain(engine, queries=DASHBOARD_QUERIES):
+    rows = []
+    with engine.connect() as conn:
+        for name, (sql, params, expected) in queries.items():
+            plan = conn.execute(text(f"EXPLAIN {sql}"), params).mappings().all()
+            for step in plan:
+                expect = expected.get(step["table"], {})
+                rows.append({
+                    "query": name,
+                    "table": step["table"],
+                    "type": step["type"],
+                    "key": step["key"],
+                    "partitions": step["partitions"],
+                    "rows": step["rows"],
+                    "expected": ", ".join(f"{k}={v}" for k, v in expect.items()),
+                    "ok": all(step[k] == v for k, v in expect.items()),
+                })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create, migrate and check the MySQL schema.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ddl", help="print the target DDL")
+    migrate_cmd = sub.add_parser("migrate", help="apply pending migrations and add year partitions")
+    migrate_cmd.add_argument("--through-year", type=int)
+    sub.add_parser("explain", help="check that dashboard queries use the keys and partitions")
+    args = parser.parse_args(argv)
+
+    if args.command == "ddl":
+        for table in TABLES:
+            print(create_statement(table) + ";\n")
+            for name, columns in INDEXES[table]:
+                print(f"CREATE INDEX {name} ON {table} ({', '.join(columns)});")
+            print()
+        print(f"ALTER TABLE transactions {partition_clause(*DEFAULT_YEARS)};")
+        return
+
+    engine = create_db_engine()
+    if args.command == "migrate":
+        for step in migrate(engine, args.through_year) or ["schema is up to date"]:
+            print(step)
+        return
+
+    plan = explain(engine)
+    print(plan.to_string(index=False))
+    if not plan["ok"].all():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
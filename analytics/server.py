@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from analytics import shared
+from analytics.data import create_db_engine, read_data_version, read_dataset
+from analytics.metrics import SECTIONS
+from analytics.structures import BUILDERS, QUERIES, REFRESHERS, build, run_query
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+AGGREGATIONS = {"sum", "mean", "count", "nunique", "min", "max"}
+
+
+def to_arrow(value):
+    if isinstance(value, pd.Series):
+        frame = value.to_frame(value.name if value.name is not None else "value")
+        kind = b"series"
+    else:
+        frame = value
+        kind = b"frame"
+    table = pa.Table.from_pandas(frame)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"kind": kind})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow(payload):
+    table = pa.ipc.open_stream(payload).read_all()
+    frame = table.to_pandas()
+    if table.schema.metadata.get(b"kind") == b"series":
+        return frame.iloc[:, 0]
+    return frame
+
+
+def _to_json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def encode_result(value):
+    # Tables go out as Arrow, anything else (scalars, dicts of scalars) as
+    # JSON; returns (body, content type).
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return to_arrow(value), ARROW_MIME
+    return json.dumps({"result": value}, default=_json_default).encode(), "application/json"
+
+
+def parse_filters(params):
+    # Filters arrive as one JSON object of column -> list of values, so values
+    # containing commas (or any other character) survive the round trip.
+    filters = json.loads(params.get("filters", "{}"))
+    if not isinstance(filters, dict) or not all(isinstance(v, list) for v in filters.values()):
+        raise ValueError("filters must be a JSON object of column -> list of values")
+    return filters
+
+
+def apply_filters(df, filters):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filters.items():
+        if column not in df.columns:
+            raise KeyError(column)
+        if values and not pd.api.types.is_bool_dtype(df[column]):
+            values = pd.Series(values).astype(df[column].dtype)
+        mask &= df[column].isin(values).to_numpy()
+    return df[mask]
+
+
+class ResultCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute()
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class AggregateService:
+    def __init__(self, load, cache_size=512, read_version=None):
+        self._load = load
+        self._read_version = read_version
+        self.cache = ResultCache(cache_size)
+        # Clients key their caches on (started, version), so a restarted
+        # service never reuses results cached for a previous process.
+        self.started = int(time.time())
+        self.version = 0
+        self.data_version = None
+        self.df = None
+        self._structures = ResultCache(len(BUILDERS))
+        self._build_locks = {name: threading.Lock() for name in BUILDERS}
+        # Newest build of each refreshable structure, kept across refreshes.
+        self._latest = {}
+        self.refresh()
+
+    def refresh(self):
+        df = self._load()
+        self.df = df
+        self.data_version = self._read_version() if self._read_version else None
+        self.version += 1
+        self.cache.clear()
+        self._structures.clear()
+
+    def section(self, name, filters):
+        df = apply_filters(self.df, filters)
+        result = SECTIONS[name](df)
+        scalars = {}
+        tables = {}
+        for key, value in result.items():
+            if isinstance(value, (pd.Series, pd.DataFrame)):
+                tables[key] = to_arrow(value)
+            else:
+                scalars[key] = _to_json_value(value)
+        return scalars, tables
+
+    def groupby(self, by, value, agg, top, filters):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"unsupported aggregation: {agg}")
+        for column in [*by, value]:
+            if column not in self.df.columns:
+                raise KeyError(column)
+        if agg in ("sum", "mean") and not pd.api.types.is_numeric_dtype(self.df[value]):
+            raise ValueError(f"{agg} needs a numeric column, {value} is {self.df[value].dtype}")
+        df = apply_filters(self.df, filters)
+        result = df.groupby(by)[value].agg(agg)
+        if top:
+            result = result.nlargest(top)
+        return result
+
+    def sample(self, columns, n, filters):
+        for column in columns:
+            if column not in self.df.columns:
+                raise KeyError(column)
+        df = apply_filters(self.df, filters)
+        return df[columns].sample(n=min(n, len(df)), random_state=0).reset_index(drop=True)
+
+    def structure(self, name):
+        # Built once per version from the service's own copy of the data and
+        # kept here; replicas only ever receive query results.
+        df = self.df
+        version = self.version
+        def compute():
+            structure = build(name, lambda: df, self.data_version, self._latest.get(name))
+            if name in REFRESHERS:
+                self._latest[name] = structure
+            return structure
+
+        with self._build_locks[name]:
+            return self._structures.get_or_compute((version, name), compute)
+
+    def query(self, name, method, args, kwargs):
+        if name not in QUERIES or method not in QUERIES[name]:
+            raise KeyError(f"{name}.{method}")
+        if not isinstance(args, list) or not isinstance(kwargs, dict):
+            raise ValueError("args must be a JSON list and kwargs a JSON object")
+        return encode_result(run_query(self.structure(name), name, method, args, kwargs))
+
+
+class Handler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Data-Version", str(self.service.version))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload, status=200):
+        self._send(status, json.dumps(payload, default=str).encode())
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        parts = [p for p in url.path.split("/") if p]
+        service = self.service
+
+        try:
+            if parts == ["health"]:
+                self._send_json({"version": service.version, "started": service.started,
+                                 "rows": len(service.df),
+                                 "cache_hits": service.cache.hits, "cache_misses": service.cache.misses})
+
+            elif len(parts) in (2, 3) and parts[0] == "kpis" and parts[1] in SECTIONS:
+                filters = parse_filters(params)
+                scalars, tables = service.cache.get_or_compute(
+                    (service.version, parts[1], tuple(sorted(params.items()))),
+                    lambda: service.section(parts[1], filters),
+                )
+                if len(parts) == 2:
+                    self._send_json({"scalars": scalars, "tables": sorted(tables)})
+                elif parts[2] in tables:
+                    self._send(200, tables[parts[2]], ARROW_MIME)
+                else:
+                    self._send_json({"error": f"unknown table: {parts[2]}"}, 404)
+
+            elif parts == ["groupby"]:
+                filters = parse_filters(params)
+                fmt = params.get("format", "arrow")
+
+                def compute():
+                    result = service.groupby(
+                        params["by"].split(","),
+                        params["value"],
+                        params.get("agg", "sum"),
+                        int(params.get("top", 0)),
+                        filters,
+                    )
+                    if fmt == "json":
+                        return result.reset_index().to_json(orient="records").encode()
+                    return to_arrow(result)
+
+                key = (service.version, "groupby", tuple(sorted(params.items())))
+                body = service.cache.get_or_compute(key, compute)
+                self._send(200, body, "application/json" if fmt == "json" else ARROW_MIME)
+
+            elif parts == ["sample"]:
+                filters = parse_filters(params)
+                key = (service.version, "sample", tuple(sorted(params.items())))
+                body = service.cache.get_or_compute(key, lambda: to_arrow(service.sample(
+                    params["columns"].split(","), int(params.get("n", 5000)), filters
+                )))
+                self._send(200, body, ARROW_MIME)
+
+            elif len(parts) == 3 and parts[0] == "query":
+                args = json.loads(params.get("args", "[]"))
+                kwargs = json.loads(params.get("kwargs", "{}"))
+                key = (service.version, "query", tuple(sorted(params.items())), *parts[1:])
+                body, content_type = service.cache.get_or_compute(
+                    key, lambda: service.query(parts[1], parts[2], args, kwargs)
+                )
+                self._send(200, body, content_type)
+
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        except KeyError as e:
+            self._send_json({"error": f"unknown column or parameter: {e}"}, 400)
+        except (ValueError, TypeError) as e:
+            self._send_json({"error": str(e)}, 400)
+        except Exception as e:
+            # Never drop the connection without a response.
+            self.log_error("%s failed: %r", self.path, e)
+            self._send_json({"error": f"{type(e).__name__}: {e}"}, 500)
+
+    def do_POST(self):
+        if urlparse(self.path).path == "/refresh":
+            self.service.refresh()
+            self._send_json({"version": self.service.version})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve dashboard aggregates over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--cache-size", type=int, default=512)
+    parser.add_argument("--shared-root", default=os.environ.get("AMAZON_SHARED_DATA", ""))
+    args = parser.parse_args(argv)
+
+    if args.shared_root:
+        load = lambda: shared.attach(args.shared_root)
+        read_version = lambda: shared.current_version(args.shared_root)
+    else:
+        engine = create_db_engine()
+        load = lambda: read_dataset(engine)
+        read_version = lambda: read_data_version(engine)
+    Handler.service = AggregateService(load, args.cache_size, read_version)
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"Serving aggregates on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from analytics.data import VERSION_TTL, create_db_engine, read_dataset
+
+CURRENT = "CURRENT"
+# A worker may still attach a version for up to VERSION_TTL seconds after it
+# was replaced (its cached data_version has not expired yet), so superseded
+# files are kept for twice that, however often the loader publishes.
+RETAIN_SUPERSEDED = 2 * VERSION_TTL
+
+
+def _dataset_path(root, version):
+    return os.path.join(root, f"dataset-{version}.arrow")
+
+
+def _replace_atomic(path, write):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def publish(df, root):
+    os.makedirs(root, exist_ok=True)
+    version = time.strftime("%Y%m%d%H%M%S") + f"-{os.getpid()}"
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    def write_table(path):
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    def write_pointer(path):
+        with open(path, "w") as f:
+            f.write(version)
+
+    _replace_atomic(_dataset_path(root, version), write_table)
+    _replace_atomic(os.path.join(root, CURRENT), write_pointer)
+
+    remove_superseded(root)
+    return version
+
+
+def remove_superseded(root, retain=RETAIN_SUPERSEDED, now=None):
+    # Version names sort by publish time. A file was superseded when the
+    # next one was written, and is removed once that is `retain` seconds ago.
+    now = time.time() if now is None else now
+    paths = sorted(glob.glob(os.path.join(root, "dataset-*.arrow")))
+    removed = []
+    for old, newer in zip(paths, paths[1:]):
+        try:
+            if now - os.path.getmtime(newer) > retain:
+                os.remove(old)
+                removed.append(old)
+        except FileNotFoundError:
+            # Another loader got there first.
+            continue
+    return removed
+
+
+def current_version(root):
+    with open(os.path.join(root, CURRENT)) as f:
+        return f.read().strip()
+
+
+def _string_mapper(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def attach(root, version=None):
+    version = version or current_version(root)
+    source = pa.memory_map(_dataset_path(root, version), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True, types_mapper=_string_mapper)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the dataset as a memory-mapped Arrow file.")
+    parser.add_argument("--root", default=os.environ.get("AMAZON_SHARED_DATA", "/dev/shm/amazon_india"))
+    parser.add_argument("--interval", type=int, default=0, help="republish every N seconds")
+    args = parser.parse_args(argv)
+
+    engine = create_db_engine()
+    while True:
+        version = publish(read_dataset(engine), args.root)
+        print(f"Published version {version} to {args.root}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+SKETCH_DIMS = ("customer_state", "customer_tier", "order_year")
+HISTOGRAM_EDGES = {
+    "delivery_days": np.arange(0, 30.5, 0.5),
+    "final_amount_inr": np.concatenate([[0], np.geomspace(10, 1e6, 61)]),
+    "customer_rating": np.arange(0, 5.5, 0.5),
+    "product_rating": np.arange(0, 5.5, 0.5),
+}
+
+
+def _compress(groups, values, weights, compression):
+    # Vectorised t-digest compression with the k1 (arcsine) scale function:
+    # within each group, points whose quantile falls into the same unit of
+    # k-space become one centroid, so centroids are small in the tails and
+    # large around the median.
+    order = np.lexsort((values, groups))
+    groups, values, weights = groups[order], values[order], weights[order]
+
+    totals = np.bincount(groups, weights)
+    cum = np.cumsum(weights)
+    start = np.concatenate([[0], np.cumsum(totals)])[groups]
+    q = (cum - start - weights / 2) / totals[groups]
+    bucket = np.floor(compression * (np.arcsin(2 * q - 1) / np.pi + 0.5)).astype(np.int64)
+
+    key = groups.astype(np.int64) * (compression + 1) + bucket
+    unique_keys, centroid_ids = np.unique(key, return_inverse=True)
+    w = np.bincount(centroid_ids, weights)
+    m = np.bincount(centroid_ids, weights * values) / w
+    return unique_keys // (compression + 1), m, w
+
+
+def _quantiles(means, weights, lo, hi, qs):
+    cum = np.cumsum(weights) - weights / 2
+    total = weights.sum()
+    if total == 0:
+        return np.full(len(qs), np.nan)
+    x = np.concatenate([[0], cum, [total]])
+    y = np.concatenate([[lo], means, [hi]])
+    return np.interp(np.asarray(qs) * total, x, y)
+
+
+class SketchCube:
+    def __init__(self, df, dims=SKETCH_DIMS, metrics=tuple(HISTOGRAM_EDGES), compression=100):
+        self.dims = list(dims)
+        self.compression = compression
+        grouped = df.groupby(self.dims, sort=False, dropna=False)
+        codes = grouped.ngroup().to_numpy()
+        self.cells = grouped.size().index.to_frame(index=False)
+        groups = len(self.cells)
+
+        self.stats = {}
+        self.digests = {}
+        self.histograms = {}
+        for metric in metrics:
+            x = df[metric].to_numpy(dtype=float)
+            valid = ~np.isnan(x)
+            c, v = codes[valid], x[valid]
+
+            count = np.bincount(c, minlength=groups)
+            lo = np.full(groups, np.inf)
+            hi = np.full(groups, -np.inf)
+            np.minimum.at(lo, c, v)
+            np.maximum.at(hi, c, v)
+            self.stats[metric] = pd.DataFrame({
+                "count": count,
+                "sum": np.bincount(c, v, minlength=groups),
+                "min": lo,
+                "max": hi,
+            })
+
+            self.digests[metric] = _compress(c, v, np.ones(len(v)), compression)
+
+            edges = HISTOGRAM_EDGES[metric]
+            bins = np.clip(np.searchsorted(edges, v, side="left"), 0, len(edges))
+            hist = np.zeros((groups, len(edges) + 1))
+            np.add.at(hist, (c, bins), 1)
+            self.histograms[metric] = hist
+
+    def select(self, **filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, values in filters.items():
+            mask &= self.cells[dim].isin(values).to_numpy()
+        return mask
+
+    def _group_codes(self, by):
+        if by is None:
+            return np.zeros(len(self.cells), dtype=np.int64), pd.Index(["all"])
+        return pd.factorize(self.cells[by], sort=True, use_na_sentinel=False)
+
+    def summary(self, metric, by=None, **filters):
+        mask = self.select(**filters)
+        codes, labels = self._group_codes(by)
+        stats = self.stats[metric][mask].groupby(codes[mask]).agg(
+            {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+        )
+        stats["mean"] = stats["sum"] / stats["count"]
+        stats.index = labels[stats.index]
+        return stats if by is not None else stats.reindex(labels)
+
+    def quantiles(self, metric, qs=(0.5, 0.9, 0.99), by=None, **filters):
+        mask = self.select(**filters)
+        codes, labels = self._group_codes(by)
+        cell, means, weights = self.digests[metric]
+        keep = mask[cell]
+        g, m, w = _compress(codes[cell[keep]], means[keep], weights[keep], self.compression)
+
+        stats = self.summary(metric, by, **filters)
+        rows = {}
+        for code, label in enumerate(labels):
+            if label not in stats.index or not stats.at[label, "count"]:
+                continue
+            sel = g == code
+            rows[label] = _quantiles(m[sel], w[sel], stats.at[label, "min"], stats.at[label, "max"], qs)
+
+        return pd.DataFrame.from_dict(
+            rows, orient="index", columns=[f"P{round(q * 100):g}" for q in qs]
+        )
+
+    def histogram(self, metric, **filters):
+        mask = self.select(**filters)
+        edges = HISTOGRAM_EDGES[metric]
+        counts = self.histograms[metric][mask].sum(axis=0)
+        # Indexed by the right edge of each (a, b] bin; the overflow bin is
+        # placed one bin width past the last edge.
+        upper = np.concatenate([edges, [2 * edges[-1] - edges[-2]]])
+        return pd.Series(counts, index=pd.Index(upper, name=metric), name="count")
+
+    def fraction_at_most(self, metric, threshold, by=None, **filters):
+        # Bins are right-closed, (a, b], so thresholds on a bin edge are exact;
+        # otherwise the bin containing the threshold is interpolated linearly.
+        # The overflow bin runs from the last edge to each cell's maximum, so
+        # a threshold at or above that maximum counts every value.
+        mask = self.select(**filters)
+        codes, labels = self._group_codes(by)
+        edges = HISTOGRAM_EDGES[metric]
+        hist = self.histograms[metric]
+
+        weights = np.zeros(len(edges) + 1)
+        weights[0] = float(threshold >= edges[0])
+        upper = edges[1:]
+        lower = edges[:-1]
+        weights[1:-1] = np.clip((threshold - lower) / (upper - lower), 0, 1)
+
+        last = edges[-1]
+        top = self.stats[metric]["max"].to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            overflow = np.where(
+                top > last, np.clip((threshold - last) / (top - last), 0, 1), float(threshold >= last)
+            )
+
+        below = hist[:, :-1] @ weights[:-1] + hist[:, -1] * overflow
+        total = hist.sum(axis=1)
+        grouped = pd.DataFrame({"below": below, "total": total})[mask].groupby(codes[mask]).sum()
+        rate = grouped["below"] / grouped["total"]
+        rate.index = labels[rate.index]
+        if by is not None:
+            return rate
+        return rate.iloc[0] if len(rate) else np.nan
@@ -0,0 +1,154 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Per-version structures the dashboards query instead of the transactions.
+# Each builder imports its module when it runs, so importing this module (or
+# analytics.cache) does not pull in scipy and the other heavy dependencies.
+
+
+def row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[list(columns)], index=False).to_numpy()
+
+
+def appended_rows(df, previous, columns):
+    # The rows of df that are new since the version hashed in `previous`, or
+    # None when any earlier row changed or disappeared; also returns df's
+    # hashes. Rows are told apart by transaction_id, so hashes are unique.
+    hashes = row_hashes(df, columns)
+    seen = np.isin(hashes, previous)
+    if seen.sum() != len(previous):
+        return None, hashes
+    return df[~seen], hashes
+
+
+def _topk_columns(index):
+    return ["transaction_id", index.value, *index.sketches]
+
+
+def build_topk(load, version):
+    from analytics.topk import TopKIndex
+
+    df = load()
+    index = TopKIndex(df)
+    index.row_hashes = row_hashes(df, _topk_columns(index))
+    return index
+
+
+def refresh_topk(previous, load, version):
+    # Appended transactions go through ingest(); the previous version's
+    # index stays untouched for sessions still reading it.
+    new, hashes = appended_rows(load(), previous.row_hashes, _topk_columns(previous))
+    if new is None:
+        return None
+    index = copy.deepcopy(previous)
+    index.ingest(new)
+    index.row_hashes = hashes
+    return index
+
+
+def build_moments(load, version):
+    from analytics.moments import MomentCube
+
+    return MomentCube(load())
+
+
+def build_sketches(load, version):
+    from analytics.sketches import SketchCube
+
+    return SketchCube(load())
+
+
+def _customer_columns():
+    from analytics.customers import ATTRIBUTES
+
+    return ["transaction_id", "customer_id", "order_year", "order_date", "final_amount_inr", *ATTRIBUTES]
+
+
+def build_customers(load, version):
+    from analytics.customers import CustomerFeatures
+
+    df = load()
+    features = CustomerFeatures.from_transactions(df)
+    features.row_hashes = row_hashes(df, _customer_columns())
+    return features
+
+
+def refresh_customers(previous, load, version):
+    # Appended transactions are applied with update(), which only touches
+    # the customer/year cells they fall in.
+    new, hashes = appended_rows(load(), previous.row_hashes, _customer_columns())
+    if new is None:
+        return None
+    features = copy.deepcopy(previous)
+    features.update(new)
+    features.row_hashes = hashes
+    return features
+
+
+def build_anomalies(load, version):
+    from analytics.anomalies import detect_anomalies, load_stored
+
+    # Prefer the table stored by the background job for this version.
+    stored = load_stored(version)
+    return stored if stored is not None else detect_anomalies(load())
+
+
+def build_pricing(load, version):
+    from analytics.pricing import PricingModel
+
+    return PricingModel(load())
+
+
+def build_interactions(load, version):
+    from analytics.affinity import InteractionMatrix
+
+    return InteractionMatrix(load()).compute_neighbors()
+
+
+BUILDERS = {
+    "topk": build_topk,
+    "moments": build_moments,
+    "sketches": build_sketches,
+    "customers": build_customers,
+    "anomalies": build_anomalies,
+    "pricing": build_pricing,
+    "interactions": build_interactions,
+}
+# Structures that can be carried forward to a new version from the previous
+# one; a refresher returns None when it has to be rebuilt instead.
+REFRESHERS = {
+    "topk": refresh_topk,
+    "customers": refresh_customers,
+}
+
+
+def build(name, load, version, previous=None):
+    if previous is not None and name in REFRESHERS:
+        refreshed = REFRESHERS[name](previous, load, version)
+        if refreshed is not None:
+            return refreshed
+    return BUILDERS[name](load, version)
+
+
+# The only methods that can be called on each structure, locally or through
+# the aggregate service's /query endpoint. Structures that are tables
+# themselves answer "table" with the whole table.
+QUERIES = {
+    "topk": {"top", "ranking", "heavy_hitters"},
+    "moments": {"summary", "corr", "regression"},
+    "sketches": {"summary", "quantiles", "histogram", "fraction_at_most"},
+    "customers": {"frame", "query"},
+    "anomalies": {"table"},
+    "pricing": {"fits", "baseline_years", "simulate", "curve"},
+    "interactions": {"stats", "product_options", "similar", "also_bought", "brand_affinity"},
+}
+
+
+def run_query(structure, name, method, args=(), kwargs=None):
+    if method not in QUERIES.get(name, ()):
+        raise KeyError(f"{name}.{method}")
+    if method == "table":
+        return structure
+    return getattr(structure, method)(*args, **(kwargs or {}))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+STATES = {
+    "Karnataka": ["bangalore", "mysore"],
+    "Maharashtra": ["mumbai", "pune", "nagpur"],
+    "Tamil Nadu": ["chennai", "coimbatore"],
+    "Delhi": ["delhi"],
+    "West Bengal": ["kolkata"],
+    "Telangana": ["hyderabad"],
+    "Gujarat": ["ahmedabad", "surat"],
+    "Rajasthan": ["jaipur"],
+}
+SUBCATEGORIES = ["Smartphones", "Laptops", "Tablets", "Audio", "Smart Watch", "Televisions", "Cameras"]
+BRANDS = ["Samsung", "Apple", "OnePlus", "Xiaomi", "Sony", "boAt", "Lenovo", "HP", "Dell", "Realme"]
+TIERS = ["Metro", "Tier1", "Tier2", "Rural"]
+SPENDING_TIERS = ["Budget", "Middle", "Premium"]
+AGE_GROUPS = ["18-25", "26-35", "36-45", "46-55", "55+", "Unknown"]
+PAYMENT_METHODS = ["UPI", "Credit Card", "Debit Card", "Cash on Delivery", "Net Banking", "BNPL"]
+DELIVERY_TYPES = ["Standard", "Express", "Same Day", "Prime"]
+FESTIVALS = ["Diwali Sale", "Prime Day", "Great Indian Festival", "Republic Day Sale"]
+
+
+def make_dataset(rows=100_000, customers=None, products=None, years=(2015, 2025), seed=0):
+    rng = np.random.default_rng(seed)
+    customers = customers or max(rows // 5, 1)
+    products = products or max(rows // 50, 1)
+
+    customer_codes = rng.integers(0, customers, rows)
+    product_codes = rng.integers(0, products, rows)
+
+    cities = [(state, city) for state, names in STATES.items() for city in names]
+    customer_city = rng.integers(0, len(cities), customers)
+    product_brand = rng.integers(0, len(BRANDS), products)
+    product_sub = rng.integers(0, len(SUBCATEGORIES), products)
+    product_price = np.round(rng.lognormal(8.5, 1.0, products), 2)
+
+    start = pd.Timestamp(f"{years[0]}-01-01")
+    span = (pd.Timestamp(f"{years[1]}-12-31") - start).days
+    order_date = start + pd.to_timedelta(rng.integers(0, span + 1, rows), unit="D")
+
+    original_price = product_price[product_codes]
+    discount = np.round(rng.choice([0, 5, 10, 15, 20, 30, 40, 50], rows), 2)
+    discounted_price = np.round(original_price * (1 - discount / 100), 2)
+    quantity = rng.integers(1, 5, rows)
+    subtotal = discounted_price * quantity
+    delivery_charges = np.where(subtotal > 499, 0.0, 40.0)
+    is_festival = rng.random(rows) < 0.3
+
+    df = pd.DataFrame({
+        "transaction_id": [f"TXN_{d.year}_{i:08d}" for i, d in enumerate(order_date)],
+        "customer_id": [f"CUST_{c:08d}" for c in customer_codes],
+        "product_id": [f"PROD_{p:06d}" for p in product_codes],
+        "order_date": order_date.normalize(),
+        "quantity": quantity,
+        "original_price_inr": original_price,
+        "discount_percent": discount,
+        "discounted_price_inr": discounted_price,
+        "subtotal_inr": subtotal,
+        "delivery_charges": delivery_charges,
+        "final_amount_inr": subtotal + delivery_charges,
+        "payment_method": rng.choice(PAYMENT_METHODS, rows),
+        "delivery_days": rng.choice([0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 12], rows).astype(float),
+        "delivery_type": rng.choice(DELIVERY_TYPES, rows),
+        "is_festival_sale": is_festival,
+        "festival_name": np.where(is_festival, rng.choice(FESTIVALS, rows), "No Festival"),
+        "customer_rating": np.round(rng.uniform(1, 5, rows), 1),
+        "return_status": rng.choice(["Delivered", "Returned", "Cancelled"], rows, p=[0.9, 0.07, 0.03]),
+        "product_name": [f"{BRANDS[product_brand[p]]} {SUBCATEGORIES[product_sub[p]]} {p}" for p in product_codes],
+        "category": "Electronics",
+        "subcategory": np.array(SUBCATEGORIES)[product_sub[product_codes]],
+        "brand": np.array(BRANDS)[product_brand[product_codes]],
+        "product_weight_kg": np.round(rng.uniform(0.1, 5, products), 2)[product_codes],
+        "product_rating": np.round(rng.uniform(2, 5, products), 1)[product_codes],
+        "is_prime_eligible": (rng.random(products) < 0.7)[product_codes],
+        "customer_city": [cities[customer_city[c]][1] for c in customer_codes],
+        "customer_state": [cities[customer_city[c]][0] for c in customer_codes],
+        "customer_tier": np.array(TIERS)[rng.integers(0, len(TIERS), customers)][customer_codes],
+        "customer_spending_tier": np.array(SPENDING_TIERS)[rng.integers(0, len(SPENDING_TIERS), customers)][customer_codes],
+        "customer_age_group": np.array(AGE_GROUPS)[rng.integers(0, len(AGE_GROUPS), customers)][customer_codes],
+        "is_prime_member": (rng.random(customers) < 0.4)[customer_codes],
+    })
+    df["order_month"] = df["order_date"].dt.month
+    df["order_year"] = df["order_date"].dt.year
+    df["order_quarter"] = df["order_date"].dt.quarter
+    return df.sort_values("order_date", ignore_index=True)
@@ -0,0 +1,106 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ["product_name", "brand", "subcategory", "customer_city", "customer_state"]
+
+
+def top_k(values, k):
+    # Partial selection: O(n) to find the k largest, then sort only those.
+    if k <= 0:
+        return values.iloc[:0]
+    if k >= len(values):
+        return values.sort_values(ascending=False)
+    arr = values.to_numpy()
+    idx = np.argpartition(-arr, k - 1)[:k]
+    idx = idx[np.argsort(-arr[idx], kind="stable")]
+    return values.iloc[idx]
+
+
+class SpaceSaving:
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Weight of rows with a missing key; they are never ranked.
+        self.missing = 0.0
+        self._heap = []
+
+    def _min_key(self):
+        while True:
+            count, key = self._heap[0]
+            if self.counts.get(key) == count:
+                return key
+            heapq.heappop(self._heap)
+
+    def update(self, keys, weights=None):
+        keys = np.asarray(keys)
+        weights = np.ones(len(keys)) if weights is None else np.asarray(weights, dtype=float)
+        missing = pd.isna(keys)
+        self.missing += weights[missing].sum()
+        batch = pd.Series(weights[~missing]).groupby(keys[~missing]).sum()
+
+        for key, weight in batch.items():
+            if key in self.counts:
+                self.counts[key] += weight
+            elif len(self.counts) < self.capacity:
+                self.counts[key] = weight
+                self.errors[key] = 0.0
+            else:
+                evicted = self._min_key()
+                floor = self.counts.pop(evicted)
+                self.errors.pop(evicted)
+                self.counts[key] = floor + weight
+                self.errors[key] = floor
+            heapq.heappush(self._heap, (self.counts[key], key))
+
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, k) for k, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k):
+        items = heapq.nlargest(k, self.counts.items(), key=lambda kv: kv[1])
+        return pd.Series(dict(items), dtype=float)
+
+    def error(self, key):
+        return self.errors.get(key, 0.0)
+
+
+class TopKIndex:
+    def __init__(self, df, dimensions=DIMENSIONS, value="final_amount_inr", sketch_capacity=1000):
+        self.value = value
+        self.rankings = {dim: pd.Series(dtype=float) for dim in dimensions}
+        self.sketches = {dim: SpaceSaving(sketch_capacity) for dim in dimensions}
+        self.ingest(df)
+
+    def ranking(self, dim):
+        return self.rankings[dim]
+
+    def top(self, dim, k):
+        return self.rankings[dim].iloc[:k]
+
+    def ingest(self, transactions):
+        # New transactions are added to the exact rankings and the sketches,
+        # so both stay current without regrouping the history.
+        for dim, sketch in self.sketches.items():
+            batch = transactions.groupby(dim)[self.value].sum()
+            self.rankings[dim] = (
+                self.rankings[dim].add(batch, fill_value=0)
+                .rename(self.value)
+                .rename_axis(dim)
+                .sort_values(ascending=False)
+            )
+            sketch.update(transactions[dim].to_numpy(), transactions[self.value].to_numpy())
+
+    def heavy_hitters(self, dim, k):
+        # Space-Saving estimates: each may overcount by at most max_error, so
+        # estimate - max_error is a guaranteed lower bound.
+        sketch = self.sketches[dim]
+        estimate = sketch.top(k)
+        error = pd.Series([sketch.error(key) for key in estimate.index], index=estimate.index, dtype=float)
+        return pd.DataFrame({
+            "estimate": estimate,
+            "max_error": error,
+            "lower_bound": estimate - error,
+        }).rename_axis(dim)
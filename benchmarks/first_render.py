@@ -0,0 +1,65 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = sorted(
+    p for p in glob.glob(os.path.join(ROOT, "pages", "*.py")) if os.path.getsize(p) > 0
+)
+
+
+def render(page, timeout):
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    app = AppTest.from_file(page, default_timeout=timeout).run()
+    first = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter()
+
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return {
+        "import_s": imported - started,
+        "first_render_s": first - started,
+        "rerun_s": rerun - first,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time-to-first-render per dashboard page.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(render(args.child, args.timeout)))
+        return
+
+    env = {**os.environ, "AMAZON_SYNTHETIC_ROWS": str(args.rows), "PYTHONPATH": ROOT}
+    results = {}
+    for page in PAGES:
+        # Each page runs in a fresh interpreter so imports and loads are cold.
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", page, "--timeout", str(args.timeout)],
+            env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        name = os.path.splitext(os.path.basename(page))[0]
+        results[name] = json.loads(out.stdout.strip().splitlines()[-1])
+        r = results[name]
+        print(f"{name:<36} first render {r['first_render_s']:7.2f}s  rerun {r['rerun_s']:6.2f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rows": args.rows, "pages": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
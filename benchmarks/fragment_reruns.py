@@ -0,0 +1,67 @@
+import argparse
+import glob
+import os
+import runpy
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def record_fragments(st, calls):
+    def fragment(func=None, **kwargs):
+        def wrap(f):
+            def call(*args, **kw):
+                calls.append((f, args, kw))
+                return f(*args, **kw)
+            return call
+        return wrap(func) if func is not None else wrap
+
+    st.fragment = fragment
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare a full page rerun with rerunning a single fragment."
+    )
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    os.environ["AMAZON_SYNTHETIC_ROWS"] = str(args.rows)
+    # Bare mode: widgets return their defaults and elements render nothing,
+    # so the timings are the page's own compute.
+    import streamlit as st
+
+    calls = []
+    record_fragments(st, calls)
+
+    for page in sorted(glob.glob(os.path.join(ROOT, "pages", "*.py"))):
+        if os.path.getsize(page) == 0:
+            continue
+        name = os.path.splitext(os.path.basename(page))[0]
+
+        runpy.run_path(page)  # warm the data caches
+        calls.clear()
+        full = timed(lambda: runpy.run_path(page), args.repeat)
+        fragments = list(calls[: len(calls) // args.repeat])
+
+        print(f"{name}: full rerun {full * 1000:8.1f} ms")
+        for func, f_args, f_kwargs in fragments:
+            t = timed(lambda: func(*f_args, **f_kwargs), args.repeat)
+            print(f"    {func.__name__:<28} {t * 1000:8.1f} ms  ({t / full:5.1%} of full rerun)")
+
+
+if __name__ == "__main__":
+    main()
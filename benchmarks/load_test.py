@@ -0,0 +1,294 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WIDGETS = ("selectbox", "multiselect", "slider")
+FINISHED_WITH_COMPILE_ERROR = 1
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, rows, timeout):
+    # The dashboards run exactly as deployed: analytics.boot warms the caches
+    # and starts `streamlit run` in its own process on synthetic data.
+    env = {**os.environ, "AMAZON_SYNTHETIC_ROWS": str(rows)}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "analytics.boot",
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"streamlit did not become healthy within {timeout:.0f}s")
+
+
+def random_state(kind, element, rng):
+    # A new value drawn from the widget's full range, encoded the way the
+    # browser would send it for this Streamlit version.
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    state = WidgetState(id=element.id)
+    fields = element.DESCRIPTOR.fields_by_name
+    if kind == "selectbox":
+        if not element.options:
+            return None
+        index = rng.randrange(len(element.options))
+        if "raw_value" in fields:
+            state.string_value = element.options[index]
+        else:
+            state.int_value = index
+    elif kind == "multiselect":
+        if not element.options:
+            return None
+        limit = element.max_selections or len(element.options)
+        indices = sorted(rng.sample(range(len(element.options)), rng.randint(1, min(limit, len(element.options)))))
+        if "raw_values" in fields:
+            state.string_array_value.data.extend(element.options[i] for i in indices)
+        else:
+            state.int_array_value.data.extend(indices)
+    elif kind == "slider":
+        step = element.step or 1
+        steps = int((element.max - element.min) / step)
+        values = sorted(element.min + rng.randint(0, steps) * step for _ in element.default)
+        state.double_array_value.data.extend(values)
+    return state
+
+
+class Session:
+    """One browser tab: a websocket to the server and the widgets on its page."""
+
+    def __init__(self, port, rng, timeout):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.rng = rng
+        self.timeout = timeout
+        self.pages = []
+        self.page = None
+        self.widgets = {}
+        self.states = {}
+        self.sent = {}
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, max_message_size=1 << 30)
+
+    async def rerun(self, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        client = msg.rerun_script
+        client.query_string = ""
+        client.widget_states.widgets.extend(self.states.values())
+        if self.page is not None:
+            client.page_script_hash = self.page.page_script_hash
+        if fragment_id:
+            client.fragment_id = fragment_id
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        return await asyncio.wait_for(self.read_until_finished(), self.timeout)
+
+    async def read_until_finished(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        errors = []
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("server closed the websocket")
+            msg = ForwardMsg.FromString(payload)
+            if msg.hash:
+                self.sent[msg.hash] = msg
+            kind = msg.WhichOneof("type")
+            if kind == "ref_hash":
+                # Already sent to this session; replay our copy.
+                msg = self.sent.get(msg.ref_hash)
+                kind = msg.WhichOneof("type") if msg is not None else None
+
+            if kind == "new_session":
+                self.pages = list(msg.new_session.app_pages)
+            elif kind == "page_not_found":
+                errors.append(f"page not found: {msg.page_not_found.page_name}")
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind == "exception":
+                    errors.append(f"{element.exception.type}: {element.exception.message}")
+                elif element_kind in WIDGETS:
+                    widget = getattr(element, element_kind)
+                    if not widget.disabled:
+                        self.widgets[widget.id] = (element_kind, widget, msg.delta.fragment_id)
+            elif kind == "script_finished":
+                if msg.script_finished == FINISHED_WITH_COMPILE_ERROR:
+                    errors.append("script failed to compile")
+                return errors
+
+    async def open(self, page):
+        self.page = page
+        self.widgets, self.states = {}, {}
+        return await self.rerun()
+
+    async def change(self):
+        # Pick one filter or top-N selector on the page and give it a random
+        # value from its full option set.
+        if not self.widgets:
+            return None, await self.rerun()
+        widget_id = self.rng.choice(sorted(self.widgets))
+        kind, element, fragment_id = self.widgets[widget_id]
+        state = random_state(kind, element, self.rng)
+        if state is None:
+            return None, await self.rerun()
+        self.states[widget_id] = state
+        return element.label, await self.rerun(fragment_id)
+
+
+async def session(index, port, steps, think, timeout, seed, samples, errors):
+    rng = random.Random(seed + index)
+    tab = Session(port, rng, timeout)
+    try:
+        await tab.connect()
+        await tab.rerun()
+    except Exception as exc:
+        errors.append(f"connect: {exc!r}")
+        return
+
+    for _ in range(steps):
+        started = time.perf_counter()
+        try:
+            if tab.page is None or rng.random() < 0.3:
+                page = rng.choice(tab.pages) if tab.pages else None
+                action = f"open {page.page_name}" if page is not None else "rerun"
+                failures = await tab.open(page)
+            else:
+                label, failures = await tab.change()
+                action = f"change {label}" if label else "rerun"
+        except Exception as exc:
+            errors.append(f"session {index}: {exc!r}")
+            break
+        samples.append(time.perf_counter() - started)
+        errors.extend(f"{action}: {failure}" for failure in failures)
+
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+    tab.ws.close()
+
+
+def percentile(samples, q):
+    if len(samples) < 2:
+        return samples[0] if samples else float("nan")
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+async def run_level(server, port, sessions, steps, think, timeout, seed):
+    samples, errors = [], []
+    before = rss_mb(server.pid)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(session(i, port, steps, think, timeout, seed, samples, errors) for i in range(sessions))
+    )
+    elapsed = time.perf_counter() - started
+    after = rss_mb(server.pid)
+
+    return {
+        "sessions": sessions,
+        "reruns": len(samples),
+        "errors": len(errors),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "throughput_rps": len(samples) / elapsed,
+        "rss_mb": after,
+        "rss_growth_per_session_mb": (after - before) / sessions,
+        "first_errors": errors[:5],
+    }
+
+
+async def warm_pages(port, timeout):
+    tab = Session(port, random.Random(0), timeout)
+    await tab.connect()
+    await tab.rerun()
+    for page in tab.pages:
+        await tab.open(page)
+    tab.ws.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent analysts clicking through the dashboards."
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--steps", type=int, default=20, help="page opens and widget changes per session")
+    parser.add_argument("--think", type=float, default=0.0, help="mean pause between actions in seconds")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--port", type=int, default=0, help="server port (default: a free one)")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    port = args.port or free_port()
+    server = start_server(port, args.rows, args.timeout)
+    try:
+        asyncio.run(warm_pages(port, args.timeout))
+        print(f"Warm: {rss_mb(server.pid):.0f} MB server RSS")
+
+        results = []
+        for sessions in args.sessions:
+            r = asyncio.run(run_level(server, port, sessions, args.steps, args.think, args.timeout, args.seed))
+            results.append(r)
+            print(
+                f"{sessions:>4} sessions  p50 {r['p50_ms']:8.1f} ms  p95 {r['p95_ms']:8.1f} ms  "
+                f"p99 {r['p99_ms']:8.1f} ms  {r['throughput_rps']:6.2f} reruns/s  "
+                f"+{r['rss_growth_per_session_mb']:6.1f} MB/session  errors {r['errors']}"
+            )
+            for error in r["first_errors"]:
+                print(f"    {error}")
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rows": args.rows, "steps": args.steps, "think": args.think, "levels": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
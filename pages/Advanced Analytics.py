@@ -0,0 +1,74 @@
+import streamlit as st
+from analytics.cache import interactions
+from analytics.plots import pyplot, seaborn
+
+st.set_page_config(layout="wide")
+st.title("🧠 Advanced Analytics")
+
+matrix = interactions()
+
+col1, col2, col3, col4 = st.columns(4)
+stats = matrix.stats()
+col1.metric("Customers", f"{stats['customers']:,}")
+col2.metric("Products", f"{stats['products']:,}")
+col3.metric("Customer-Product Pairs", f"{stats['pairs']:,}")
+col4.metric("Matrix Density", f"{stats['density'] * 100:.4f}%")
+
+
+@st.fragment
+def product_recommendations(matrix):
+    st.header("🔗 Similar products & frequently bought together")
+
+    info = matrix.product_options(1000)
+    f1, f2 = st.columns([3, 1])
+    with f1:
+        product_id = st.selectbox(
+            "Select product (most purchased first)",
+            info.index,
+            format_func=lambda pid: f"{info.at[pid, 'product_name']} · {info.at[pid, 'brand']}"
+        )
+    with f2:
+        top_n = st.selectbox("Show top", [5, 10, 20], index=1)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Similar products")
+        st.caption("Cosine similarity over the customers who bought each product")
+        st.dataframe(matrix.similar(product_id, top_n), hide_index=True)
+
+    with col2:
+        st.subheader("Customers who bought this also bought")
+        st.caption("Across each buyer's full purchase history; lift > 1 means above the product's usual reach")
+        st.dataframe(matrix.also_bought(product_id, top_n), hide_index=True)
+
+
+@st.fragment
+def brand_affinity(matrix):
+    st.header("🏷️ Brand affinity by customer tier")
+
+    affinity = matrix.brand_affinity()
+    brand_spend = affinity.groupby("brand")["spend"].sum().sort_values(ascending=False)
+
+    top_n = st.selectbox("Top brands by spend", [10, 20, 30], key="affinity_top_n")
+    brands = brand_spend.index[:top_n]
+    view = affinity[affinity["brand"].isin(brands)]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Affinity index (1.0 = average share)")
+        pivot = view.pivot(index="customer_tier", columns="brand", values="affinity")[brands]
+        plt, sns = pyplot(), seaborn()
+        fig, ax = plt.subplots(figsize=(8, 4))
+        sns.heatmap(pivot, annot=True, fmt=".2f", cmap="RdYlGn", center=1.0, ax=ax)
+        st.pyplot(fig)
+
+    with col2:
+        st.subheader("Buyers per brand by tier")
+        st.bar_chart(view.pivot(index="brand", columns="customer_tier", values="buyers").loc[brands])
+
+
+product_recommendations(matrix)
+
+st.divider()
+
+brand_affinity(matrix)
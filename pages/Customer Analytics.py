@@ -1,13 +1,13 @@
 import streamlit as st
 import pandas as pd
-from Home import load_data
-import matplotlib.pyplot as plt
-import seaborn as sns
+from analytics.cache import customer_features, distinct, section_metrics
+from analytics.plots import pyplot, seaborn
 
 st.set_page_config(layout="wide")
 st.title("👥 Customer Analytics Dashboard")
 
-df = load_data()
+years = distinct("order_year")
+tiers = distinct("customer_tier")
 
 st.subheader("Filters")
 f1, f2 = st.columns(2)
@@ -15,32 +15,31 @@ f1, f2 = st.columns(2)
 with f1:
     year_filter = st.multiselect(
         "Select Year",
-        sorted(df["order_year"].unique()),
-        default=sorted(df["order_year"].unique())
+        years,
+        default=years
     )
 
 with f2:
     tier_filter = st.multiselect(
         "Select Customer Tier",
-        df["customer_tier"].unique(),
-        default=df["customer_tier"].unique()
+        tiers,
+        default=tiers
     )
 
-filtered_df = df[
-    (df["order_year"].isin(year_filter)) &
-    (df["customer_tier"].isin(tier_filter))
-]
+metrics = section_metrics("customers", order_year=year_filter, customer_tier=tier_filter)
+
+customers = customer_features().query(years=year_filter, tiers=tier_filter)
 
 st.divider()
 st.subheader("Key Customer Metrics")
 
 k1, k2, k3, k4 = st.columns(4)
 
-total_customers = filtered_df["customer_id"].nunique()
-total_revenue = filtered_df["final_amount_inr"].sum()
-avg_clv = filtered_df.groupby("customer_id")["final_amount_inr"].sum().mean()
+total_customers = len(customers)
+total_revenue = customers["lifetime_spend"].sum()
+avg_clv = customers["lifetime_spend"].mean()
 
-repeat_customers = filtered_df[filtered_df.duplicated("customer_id", keep=False)]["customer_id"].nunique()
+repeat_customers = (customers["order_count"] > 1).sum()
 retention_rate = (repeat_customers / total_customers) * 100 if total_customers > 0 else 0
 
 k1.metric("Total Customers", total_customers)
@@ -51,33 +50,39 @@ k4.metric("Retention Rate", f"{retention_rate:.2f}%")
 st.divider()
 st.subheader("🔄 Customer Journey Analysis")
 
-purchase_count = filtered_df.groupby("customer_id")["transaction_id"].count()
-journey_df = purchase_count.reset_index()
-journey_df.columns = ["customer_id", "purchase_count"]
-
-journey_df["Customer_Type"] = journey_df["purchase_count"].apply(
-    lambda x: "New" if x == 1 else "Repeat"
-)
-
 c1, c2 = st.columns(2)
 
 with c1:
-    st.bar_chart(journey_df["Customer_Type"].value_counts())
+    st.bar_chart(customers["customer_type"].value_counts())
 
 with c2:
+    plt, sns = pyplot(), seaborn()
     fig, ax = plt.subplots()
-    sns.histplot(journey_df["purchase_count"], bins=30, ax=ax)
+    sns.histplot(customers["order_count"], bins=30, ax=ax)
     ax.set_title("Purchase Frequency Distribution")
     st.pyplot(fig)
 
 st.divider()
+st.subheader("🎯 RFM Segmentation")
+
+r1, r2 = st.columns(2)
 
-prime_summary = filtered_df.groupby("is_prime_member").agg({
-    "final_amount_inr": ["mean", "sum"],
-    "transaction_id": "count"
-})
+with r1:
+    st.bar_chart(customers["segment"].value_counts())
+
+with r2:
+    segment_summary = customers.groupby("segment").agg(
+        customers=("customer_id", "count"),
+        avg_recency_days=("recency_days", "mean"),
+        avg_orders=("order_count", "mean"),
+        avg_spend=("lifetime_spend", "mean"),
+        avg_order_value=("avg_order_value", "mean"),
+    ).sort_values("avg_spend", ascending=False)
+    st.dataframe(segment_summary)
+
+st.divider()
 
-prime_revenue_share = filtered_df.groupby("is_prime_member")["final_amount_inr"].sum() / total_revenue * 100
+prime_revenue_share = metrics["prime_revenue_share"]
 
 p1, p2 = st.columns(2)
 
@@ -87,12 +92,12 @@ with p1:
 
 with p2:
     st.subheader("Avg Spend by prime vs non prime members")
-    st.bar_chart(prime_summary["final_amount_inr"]["mean"])
+    st.bar_chart(metrics["prime_avg_spend"])
 
 st.divider()
 st.subheader("📈 Customer Retention Trend")
 
-yearly_customers = filtered_df.groupby("order_year")["customer_id"].nunique()
+yearly_customers = metrics["yearly_customers"]
 st.line_chart(yearly_customers)
 
 st.divider()
@@ -101,21 +106,21 @@ st.subheader("👶 Demographics & Behavior Analysis")
 d1, d2 = st.columns(2)
 
 with d1:
-    age_revenue = filtered_df.groupby("customer_age_group")["final_amount_inr"].sum()
+    age_revenue = metrics["age_revenue"]
     st.bar_chart(age_revenue)
 
 with d2:
-    tier_aov = filtered_df.groupby("customer_tier")["final_amount_inr"].mean()
+    tier_aov = metrics["tier_aov"]
     st.bar_chart(tier_aov)
 
 d3, d4 = st.columns(2)
 
 with d3:
     st.subheader("State wise Revenue")
-    state_revenue = filtered_df.groupby("customer_state")["final_amount_inr"].sum()
+    state_revenue = metrics["state_revenue"]
     st.bar_chart(state_revenue)
 
 with d4:
     st.subheader("City wise Revenue")
-    city_revenue = filtered_df.groupby("customer_city")["final_amount_inr"].mean()
+    city_revenue = metrics["city_revenue"]
     st.bar_chart(city_revenue)
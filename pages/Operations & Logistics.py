@@ -1,155 +1,151 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from Home import load_data
+from analytics.cache import distinct, section_metrics, sketch_cube
+from analytics.plots import pyplot
 
 
 st.set_page_config(layout="wide")
 st.title("Operations & Logistics")
-st.header("Delivery Performance Dashboard")
 
-df = load_data()
 
-st.subheader("Filters")
+@st.fragment
+def delivery_performance(sketches, delivery_filters):
+    on_time_days = st.slider("On-time threshold (days)", 1, 15, 5)
 
-f1, f2 = st.columns(2)
+    st.subheader("Delivery Performance KPIs")
 
-with f1:
-    year_filter = st.multiselect(
-        "Select Year",
-        sorted(df["order_year"].unique()),
-        default=sorted(df["order_year"].unique())
-    )
+    on_time_rate = sketches.fraction_at_most("delivery_days", on_time_days, **delivery_filters) * 100
+    if pd.isna(on_time_rate):
+        st.info("No deliveries for the selected years and states")
+        return
 
-with f2:
-    state_filter = st.multiselect(
-        "Select State",
-        df["customer_state"].unique(),
-        default=df["customer_state"].unique()
-    )
+    k1, k2, k3, k4 = st.columns(4)
 
-filtered_df = df[
-    (df["order_year"].isin(year_filter)) &
-    (df["customer_state"].isin(state_filter))
-].copy()
+    delivery_stats = sketches.summary("delivery_days", **delivery_filters)
+    avg_delivery = delivery_stats["mean"].iloc[0]
+    fastest_delivery = delivery_stats["min"].iloc[0]
+    slowest_delivery = delivery_stats["max"].iloc[0]
 
+    k1.metric("Average Delivery Days", round(avg_delivery, 2))
+    k2.metric("On-Time Delivery Rate", f"{on_time_rate:.2f}%")
+    k3.metric("Fastest Delivery", fastest_delivery)
+    k4.metric("Slowest Delivery", slowest_delivery)
 
-filtered_df["On_Time"] = filtered_df["delivery_days"].apply(
-    lambda x: 1 if x <= 5 else 0
-)
+    col1, col2 = st.columns(2)
 
-st.subheader("Delivery Performance KPIs")
+    with col1:
+        st.subheader("Delivery Days Distribution")
+        delivery_hist = sketches.histogram("delivery_days", **delivery_filters)
+        st.bar_chart(delivery_hist[delivery_hist > 0])
 
-k1, k2, k3, k4 = st.columns(4)
+    with col2:
+        st.subheader("On-Time vs Delayed Orders")
+        plt = pyplot()
+        fig2, ax2 = plt.subplots()
+        ax2.pie(
+            [on_time_rate, 100 - on_time_rate],
+            labels=["On-Time", "Delayed"],
+            autopct="%1.1f%%"
+        )
+        st.pyplot(fig2)
 
-avg_delivery = filtered_df["delivery_days"].mean()
-on_time_rate = (filtered_df["On_Time"].sum() / len(filtered_df)) * 100
-fastest_delivery = filtered_df["delivery_days"].min()
-slowest_delivery = filtered_df["delivery_days"].max()
+    col3, col4 = st.columns(2)
 
-k1.metric("Average Delivery Days", round(avg_delivery, 2))
-k2.metric("On-Time Delivery Rate", f"{on_time_rate:.2f}%")
-k3.metric("Fastest Delivery", fastest_delivery)
-k4.metric("Slowest Delivery", slowest_delivery)
+    with col3:
+        st.subheader("Average Delivery Days by State")
+        state_avg = sketches.summary("delivery_days", by="customer_state", **delivery_filters)["mean"].sort_values()
+        st.bar_chart(state_avg)
 
-col1, col2 = st.columns(2)
+    with col4:
+        st.subheader("On-Time Rate by State")
+        state_ontime = sketches.fraction_at_most(
+            "delivery_days", on_time_days, by="customer_state", **delivery_filters
+        ) * 100
+        st.bar_chart(state_ontime)
 
-with col1:
-    st.subheader("Delivery Days Distribution")
-    fig1, ax1 = plt.subplots()
-    sns.histplot(filtered_df["delivery_days"], bins=30, ax=ax1)
-    ax1.set_xlabel("Delivery Days")
-    st.pyplot(fig1)
+    st.subheader("Delivery Time Percentiles (days)")
 
-with col2:
-    st.subheader("On-Time vs Delayed Orders")
-    on_time_counts = filtered_df["On_Time"].value_counts()
-    fig2, ax2 = plt.subplots()
-    ax2.pie(
-        on_time_counts,
-        labels=["On-Time", "Delayed"],
-        autopct="%1.1f%%"
-    )
-    st.pyplot(fig2)
+    p1, p2, p3 = st.columns(3)
 
-col3, col4 = st.columns(2)
+    with p1:
+        st.caption("By state")
+        st.dataframe(sketches.quantiles("delivery_days", by="customer_state", **delivery_filters))
 
-with col3:
-    st.subheader("Average Delivery Days by State")
-    state_avg = filtered_df.groupby("customer_state")["delivery_days"].mean().sort_values()
-    st.bar_chart(state_avg)
+    with p2:
+        st.caption("By customer tier")
+        st.dataframe(sketches.quantiles("delivery_days", by="customer_tier", **delivery_filters))
 
-with col4:
-    st.subheader("On-Time Rate by State")
-    state_ontime = filtered_df.groupby("customer_state")["On_Time"].mean() * 100
-    st.bar_chart(state_ontime)
+    with p3:
+        st.caption("By year")
+        st.dataframe(sketches.quantiles("delivery_days", by="order_year", **delivery_filters))
 
-st.subheader("Delivery Performance Trend Over Years")
+    st.subheader("Delivery Performance Trend Over Years")
 
-yearly_delivery = filtered_df.groupby("order_year")["delivery_days"].mean()
-st.line_chart(yearly_delivery)
+    yearly_delivery = sketches.summary("delivery_days", by="order_year", **delivery_filters)["mean"]
+    st.line_chart(yearly_delivery)
 
 
-st.divider()
-st.header("Payment Analytics Dashboard")
-st.subheader("Payment KPIs")
+@st.fragment
+def returns_dashboard(years, categories):
+    st.subheader("Filters")
 
-k1, k2, k3 = st.columns(3)
+    f1, f2 = st.columns(2)
 
-total_transactions = len(filtered_df)
-total_revenue = filtered_df["final_amount_inr"].sum()
-most_used_method = filtered_df["payment_method"].value_counts().idxmax()
+    with f1:
+        year_filter = st.multiselect(
+            "Select Year",
+            years,
+            default=years,
+            key="delivery_year_filter"
+        )
 
-k1.metric("Total Transactions", total_transactions)
-k2.metric("Total Revenue", f"₹ {total_revenue:,.0f}")
-k3.metric("Most Used Method", most_used_method)
+    with f2:
+        category_filter = st.multiselect(
+            "Select Category",
+            categories,
+            default=categories
+        )
 
-col1, col2 = st.columns(2)
+    returns = section_metrics("operations", order_year=year_filter, subcategory=category_filter)
 
-with col1:
-    st.subheader("Payment Method Preference (Transaction Count)")
-    payment_counts = filtered_df["payment_method"].value_counts()
-    st.bar_chart(payment_counts)
+    total_orders = returns["total_transactions"]
+    return_rate = returns["return_rate"]
+    revenue_loss = returns["revenue_lost"]
+    st.subheader("📌 Return KPIs")
 
-with col2:
-    st.subheader("Revenue by Payment Method")
-    payment_revenue = filtered_df.groupby("payment_method")["final_amount_inr"].sum()
-    st.bar_chart(payment_revenue)
+    k1, k2, k3 = st.columns(3)
 
-col3, col4 = st.columns(2)
+    k1.metric("Total Orders", total_orders)
+    k2.metric("Return Rate (%)", f"{return_rate:.2f}%")
+    k3.metric("Revenue Lost (₹)", f"{revenue_loss:,.0f}")
 
-with col3:
-    st.subheader("Payment Market Share (%)")
-    market_share = (payment_revenue / total_revenue) * 100
-    fig, ax = plt.subplots()
-    ax.pie(
-        market_share,
-        labels=market_share.index,
-        autopct="%1.1f%%"
-    )
-    st.pyplot(fig)
+    col1, col2 = st.columns(2)
 
-with col4:
-    st.subheader("Payment Trend Evolution (Yearly Revenue)")
+    with col1:
+        st.subheader("Returns by Category")
+        return_by_cat = returns["returns_by_category"]
+        st.bar_chart(return_by_cat)
 
-    payment_trend = (
-        filtered_df.groupby(["order_year", "payment_method"])
-        ["final_amount_inr"]
-        .sum()
-        .reset_index()
-    )
+    with col2:
+        st.subheader("Return Trend Over Years")
+        yearly_returns = returns["yearly_returns"]
+        st.line_chart(yearly_returns)
 
-    pivot_payment = payment_trend.pivot(
-        index="order_year",
-        columns="payment_method",
-        values="final_amount_inr"
-    )
+    col3, col4 = st.columns(2)
 
-    st.line_chart(pivot_payment)
+    with col3:
+        st.subheader("Return Rate by Category (%)")
+        st.bar_chart(returns["category_return_rate"])
 
-st.divider()
-st.header("Return & Cancellation Dashboard")
+    with col4:
+        st.subheader("Return Rate by Rating Group (%)")
+        st.bar_chart(returns["rating_group_return_rate"])
+
+
+st.header("Delivery Performance Dashboard")
+
+years = distinct("order_year")
+states = distinct("customer_state")
 
 st.subheader("Filters")
 
@@ -158,73 +154,73 @@ f1, f2 = st.columns(2)
 with f1:
     year_filter = st.multiselect(
         "Select Year",
-        sorted(df["order_year"].unique()),
-        default=sorted(df["order_year"].unique()),
-        key="delivery_year_filter"
+        years,
+        default=years
     )
 
 with f2:
-    category_filter = st.multiselect(
-        "Select Category",
-        df["subcategory"].unique(),
-        default=df["subcategory"].unique()
+    state_filter = st.multiselect(
+        "Select State",
+        states,
+        default=states
     )
 
-filtered_df = df[
-    (df["order_year"].isin(year_filter)) &
-    (df["subcategory"].isin(category_filter))
-].copy()
+sketches = sketch_cube()
+delivery_filters = {"order_year": year_filter, "customer_state": state_filter}
 
-return_df = filtered_df[filtered_df["return_status"] == "Returned"]
+delivery_performance(sketches, delivery_filters)
 
-total_orders = len(filtered_df)
-total_returns = len(return_df)
-return_rate = (total_returns / total_orders) * 100 if total_orders > 0 else 0
-
-revenue_loss = return_df["final_amount_inr"].sum()
-st.subheader("📌 Return KPIs")
+st.divider()
+st.header("Payment Analytics Dashboard")
+st.subheader("Payment KPIs")
 
 k1, k2, k3 = st.columns(3)
 
-k1.metric("Total Orders", total_orders)
-k2.metric("Return Rate (%)", f"{return_rate:.2f}%")
-k3.metric("Revenue Lost (₹)", f"{revenue_loss:,.0f}")
+payments = section_metrics("operations", **delivery_filters)
+
+total_transactions = payments["total_transactions"]
+total_revenue = payments["total_revenue"]
+most_used_method = payments["most_used_method"]
+
+k1.metric("Total Transactions", total_transactions)
+k2.metric("Total Revenue", f"₹ {total_revenue:,.0f}")
+k3.metric("Most Used Method", most_used_method)
 
 col1, col2 = st.columns(2)
 
 with col1:
-    st.subheader("Returns by Category")
-    return_by_cat = return_df.groupby("subcategory")["transaction_id"].count()
-    st.bar_chart(return_by_cat)
+    st.subheader("Payment Method Preference (Transaction Count)")
+    payment_counts = payments["payment_counts"]
+    st.bar_chart(payment_counts)
 
 with col2:
-    st.subheader("Return Trend Over Years")
-    yearly_returns = return_df.groupby("order_year")["transaction_id"].count()
-    st.line_chart(yearly_returns)
+    st.subheader("Revenue by Payment Method")
+    payment_revenue = payments["payment_revenue"]
+    st.bar_chart(payment_revenue)
 
 col3, col4 = st.columns(2)
 
 with col3:
-    st.subheader("Return Rate by Category (%)")
-
-    category_orders = filtered_df.groupby("subcategory")["transaction_id"].count()
-    category_returns = return_df.groupby("subcategory")["transaction_id"].count()
-
-    category_return_rate = (category_returns / category_orders) * 100
-    st.bar_chart(category_return_rate)
+    st.subheader("Payment Market Share (%)")
+    market_share = payments["payment_share"].dropna()
+    if market_share.empty:
+        st.info("No payments for the selected years and states")
+    else:
+        plt = pyplot()
+        fig, ax = plt.subplots()
+        ax.pie(
+            market_share,
+            labels=market_share.index,
+            autopct="%1.1f%%"
+        )
+        st.pyplot(fig)
 
 with col4:
-    st.subheader("Return Rate by Rating Group (%)")
+    st.subheader("Payment Trend Evolution (Yearly Revenue)")
 
-    filtered_df["rating_group"] = pd.cut(
-        filtered_df["product_rating"],
-        bins=[0,2,3,4,5],
-        labels=["Low (0-2)", "Medium (2-3)", "High (3-4)", "Very High (4-5)"]
-    )
+    st.line_chart(payments["payment_trend"])
 
-    return_rate = (
-        filtered_df.groupby("rating_group")["return_status"]
-        .apply(lambda x: (x == "Returned").mean() * 100)
-    )
+st.divider()
+st.header("Return & Cancellation Dashboard")
 
-    st.bar_chart(return_rate)
\ No newline at end of file
+returns_dashboard(years, distinct("subcategory"))
\ No newline at end of file
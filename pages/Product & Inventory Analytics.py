@@ -1,116 +1,260 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from Home import load_data
+from analytics.cache import aggregate, distinct, section_metrics, topk_index
+from analytics.plots import pyplot
+from analytics.topk import top_k
 
 st.set_page_config(layout="wide")
 st.title("Product & Inventory Analytics")
 
-st.header("📦 Product Performance Dashboard")
 
-df = load_data()
+@st.fragment
+def top_products_section(rankings):
+    top_n = st.selectbox("Select Top N Products", [5,10,15,20])
 
-product_summary = df.groupby("product_name").agg({
-    "final_amount_inr": "sum",
-    "quantity": "sum",
-    "product_rating": "mean",
-    "return_status": lambda x: (x == "Returned").mean() * 100
-}).reset_index()
+    top_products = rankings.top("product_name", top_n).reset_index()
 
-top_n = st.selectbox("Select Top N Products", [5,10,15,20])
+    col1, col2 = st.columns(2)
 
-top_products = product_summary.sort_values(
-    "final_amount_inr", ascending=False
-).head(top_n)
+    plt = pyplot()
 
-col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Top products by revenue")
 
-with col1:
-    st.subheader("Top products by revenue")
+        plt.figure()
+        plt.barh(top_products["product_name"], top_products["final_amount_inr"])
+        plt.xlabel("Revenue")
+        plt.gca().invert_yaxis()
+        st.pyplot(plt)
 
-    plt.figure()
-    plt.barh(top_products["product_name"], top_products["final_amount_inr"])
-    plt.xlabel("Revenue")
-    plt.gca().invert_yaxis()
-    st.pyplot(plt)
+    with col2:
+        st.subheader("Category-wise Revenue")
+        category_rev = rankings.ranking("subcategory").sort_index()
 
-with col2:
-    st.subheader("Category-wise Revenue")
-    category_rev = df.groupby("subcategory")["final_amount_inr"].sum()
+        plt.figure()
+        plt.barh(category_rev.index, category_rev.values)
+        plt.xlabel("Revenue")
+        st.pyplot(plt)
 
-    plt.figure()
-    plt.barh(category_rev.index, category_rev.values)
-    plt.xlabel("Revenue")
-    st.pyplot(plt)
 
+@st.fragment
+def heavy_hitters_section(rankings):
+    st.subheader("Heavy hitters (streaming estimate)")
+    st.caption("Space-Saving sketch kept current as new orders arrive; true revenue is at least the lower bound")
+    h1, h2 = st.columns(2)
+    with h1:
+        dim = st.selectbox("By", ["product_name", "brand", "customer_city", "customer_state"], key="heavy_dim")
+    with h2:
+        top_n = st.selectbox("Show top", [10, 20, 50], key="heavy_top_n")
 
-st.subheader("Product Lifecycle Trend")
-col3, col4 = st.columns(2)
-with col3:
+    hitters = rankings.heavy_hitters(dim, top_n)
+    hitters["exact"] = rankings.ranking(dim).reindex(hitters.index)
+    st.dataframe(hitters.round(0))
+
+
+@st.fragment
+def product_trend():
+    plt = pyplot()
     selected_product = st.selectbox(
         "Select Product",
-        df["product_name"].unique()
+        distinct("product_name")
     )
-    product_trend = df[df["product_name"] == selected_product].groupby("order_year")["final_amount_inr"].sum()
+    product_trend = aggregate("order_year", "final_amount_inr", product_name=[selected_product])
     plt.figure()
     plt.plot(product_trend.index, product_trend.values)
     plt.xlabel("Year")
     plt.ylabel("Total Revenue")
     st.pyplot(plt)
-with col4:
+
+
+@st.fragment
+def brand_units(brands):
+    plt = pyplot()
     selected_product1 = st.multiselect(
         "Select brand",
-        sorted(df["brand"].unique().tolist()),
-        default=sorted(df["brand"].unique().tolist())[:5]
+        brands,
+        default=brands[:5]
 
     )
-    units_sold = df[df["brand"].isin(selected_product1)].groupby("brand")["quantity"].sum().reset_index()
+    units_sold = aggregate("brand", "quantity", brand=selected_product1).reset_index()
     plt.figure()
     plt.plot(units_sold["brand"], units_sold["quantity"])
     plt.xlabel("Brand")
     plt.ylabel("Total units sold")
     st.pyplot(plt)
 
-st.divider()
-
-st.header("💰 Brand Analytics Dashboard")
-
-brand_rev = df.groupby("brand")["final_amount_inr"].sum().sort_values(ascending=False)
-select_num = st.selectbox(
-    "Select Top N", [5, 10, 15, 20]
-)
-col5, col6 = st.columns(2)
 
-with col5:
-    st.subheader("Brand Revenue Ranking")
+@st.fragment
+def brand_ranking(rankings):
+    plt = pyplot()
+    brand_rev = rankings.ranking("brand")
+    select_num = st.selectbox(
+        "Select Top N", [5, 10, 15, 20]
+    )
+    col5, col6 = st.columns(2)
+
+    with col5:
+        st.subheader("Brand Revenue Ranking")
+        plt.figure()
+        plt.barh(brand_rev.head(select_num).index, brand_rev.head(select_num).values)
+        plt.gca().invert_yaxis()
+        plt.xlabel("Revenue")
+        st.pyplot(plt)
+
+    with col6:
+        st.subheader("Brand Market Share")
+        total_rev = brand_rev.sum()
+        brand_share = (brand_rev / total_rev) * 100
+        plt.figure()
+        plt.pie(brand_share.head(select_num), labels=brand_share.head(select_num).index, autopct='%1.1f%%')
+        st.pyplot(plt)
+
+
+@st.fragment
+def brand_growth(brands):
+    plt = pyplot()
+    st.subheader("Brand Growth Over Years")
+    selected_brand = st.selectbox("Select Brand", brands)
+    brand_trend = aggregate("order_year", "final_amount_inr", brand=[selected_brand])
     plt.figure()
-    plt.barh(brand_rev.head(select_num).index, brand_rev.head(select_num).values)
-    plt.gca().invert_yaxis()
-    plt.xlabel("Revenue")
+    plt.plot(brand_trend.index, brand_trend.values)
+    plt.xlabel("Year")
+    plt.ylabel("Revenue")
     st.pyplot(plt)
 
-with col6:
-    st.subheader("Brand Market Share")
-    total_rev = df["final_amount_inr"].sum()
-    brand_share = (brand_rev / total_rev) * 100
+
+@st.fragment
+def rating_section(categories):
+    plt = pyplot()
+    st.header("⭐ Product Rating & Review Dashboard")
+    st.subheader("Filter Options")
+
+    selected_category = st.selectbox(
+        "Select Category",
+        ["All"] + categories
+    )
+
+    filters = {}
+    if selected_category != "All":
+        filters = {"subcategory": [selected_category]}
+
+    # Ratings take few distinct values, so counts per rating give the mean
+    # and the histogram without reading the rows.
+    rating_counts = aggregate("product_rating", "product_rating", "count", **filters)
+    total_reviews = rating_counts.sum()
+    avg_rating = (rating_counts.index * rating_counts).sum() / total_reviews if total_reviews else float("nan")
+    total_revenue = aggregate("subcategory", "final_amount_inr", **filters).sum()
+
+    col1, col2, col3 = st.columns(3)
+
+    col1.metric("Average Rating", round(avg_rating, 2))
+    col2.metric("Total Reviews", total_reviews)
+    col3.metric("Total Revenue", f"₹ {int(total_revenue)}")
+
+    col11, col12 = st.columns(2)
+    with col11:
+        st.subheader("📊 Rating Distribution")
+
+        plt.figure()
+        plt.hist(rating_counts.index, bins=5, weights=rating_counts.values)
+        plt.xlabel("Rating")
+        plt.ylabel("Count")
+        st.pyplot(plt)
+
+    with col12:
+        st.subheader("📈 Rating vs Revenue")
+
+        rating_sales = aggregate("product_rating", "final_amount_inr", **filters)
+
+        plt.figure()
+        plt.scatter(rating_sales.index, rating_sales.values)
+        plt.xlabel("Rating")
+        plt.ylabel("Revenue")
+        st.pyplot(plt)
+
+    st.subheader("Return Rate vs Rating")
+
+    return_analysis = aggregate("product_rating", "is_returned", "mean", **filters) * 100
+
     plt.figure()
-    plt.pie(brand_share.head(select_num), labels=brand_share.head(select_num).index, autopct='%1.1f%%')
+    plt.plot(return_analysis.index, return_analysis.values)
+    plt.xlabel("Rating")
+    plt.ylabel("Return Rate (%)")
     st.pyplot(plt)
 
+
+@st.fragment
+def launch_section(metrics):
+    plt = pyplot()
+    st.header("🚀 New Product Launch Dashboard")
+    launches = metrics["launch_summary"]
+
+    st.subheader("Filter Options")
+
+    selected_year = st.selectbox(
+        "Select Launch Year",
+        sorted(launches.index)
+    )
+    launch = launches.loc[selected_year]
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    col1.metric("Total Launch Revenue", f"₹ {int(launch['launch_revenue'])}")
+    col2.metric("Products Launched", int(launch["products_launched"]))
+    col3.metric("Avg Launch Rating", round(launch["avg_launch_rating"], 2))
+    col4.metric("Launch Return Rate (%)", round(launch["launch_return_rate"]*100, 2))
+
+    col7, col8 = st.columns(2)
+
+    with col7:
+        st.subheader("Top Launch Products by Revenue")
+        top_launch = top_k(metrics["launch_product_revenue"].xs(selected_year, level="launch_year"), 10)
+
+        plt.figure()
+        plt.barh(top_launch.index, top_launch.values)
+        plt.xlabel("Revenue")
+        plt.gca().invert_yaxis()
+        st.pyplot(plt)
+
+    with col8:
+        st.subheader("📊 Launch Revenue by Category")
+        category_launch = metrics["launch_category_revenue"].xs(selected_year, level="launch_year")
+
+        plt.figure()
+        plt.bar(category_launch.index, category_launch.values)
+        plt.xticks(rotation=45)
+        st.pyplot(plt)
+
+
+st.header("📦 Product Performance Dashboard")
+
+rankings = topk_index()
+brands = distinct("brand")
+
+top_products_section(rankings)
+heavy_hitters_section(rankings)
+
+st.subheader("Product Lifecycle Trend")
+col3, col4 = st.columns(2)
+with col3:
+    product_trend()
+with col4:
+    brand_units(brands)
+
+st.divider()
+
+st.header("💰 Brand Analytics Dashboard")
+
+brand_ranking(rankings)
+
 col7, col8 = st.columns(2)
 
 with col7:
-    st.subheader("Brand Growth Over Years")
-    selected_brand = st.selectbox("Select Brand", df["brand"].unique())
-    brand_trend = df[df["brand"] == selected_brand].groupby("order_year")["final_amount_inr"].sum()
-    plt.figure()
-    plt.plot(brand_trend.index, brand_trend.values)
-    plt.xlabel("Year")
-    plt.ylabel("Revenue")
-    st.pyplot(plt)
+    brand_growth(brands)
 with col8:
+    plt = pyplot()
     st.subheader("Customer preference")
-    customer_pref = df.groupby("subcategory")["customer_id"].count()
+    customer_pref = aggregate("subcategory", "customer_id", "count")
     plt.figure()
     plt.plot(customer_pref.index, customer_pref.values)
     plt.xticks(rotation=45)
@@ -120,7 +264,7 @@ with col8:
 st.divider()
 st.header("📦 Inventory Optimization Dashboard")
 
-monthly_demand = df.groupby("order_month")["quantity"].sum()
+monthly_demand = aggregate("order_month", "quantity")
 
 col9, col10 = st.columns(2)
 
@@ -134,7 +278,7 @@ with col9:
 
 with col10:
     st.subheader("Seasonal Revenue Trend")
-    seasonal = df.groupby("order_quarter")["final_amount_inr"].sum()
+    seasonal = aggregate("order_quarter", "final_amount_inr")
     plt.figure()
     plt.bar(seasonal.index, seasonal.values)
     plt.xlabel("Quater")
@@ -143,7 +287,7 @@ with col10:
 
 st.subheader("Demand Forecast (Simple Rolling Average)")
 
-yearly = df.groupby("order_year")["quantity"].sum()
+yearly = aggregate("order_year", "quantity")
 forecast = yearly.rolling(3).mean()
 
 plt.figure()
@@ -156,96 +300,9 @@ st.pyplot(plt)
 
 
 st.divider()
-st.header("⭐ Product Rating & Review Dashboard")
-st.subheader("Filter Options")
-
-selected_category = st.selectbox(
-    "Select Category",
-    ["All"] + list(df["subcategory"].unique())
-)
-
-if selected_category != "All":
-    filtered_df = df[df["subcategory"] == selected_category]
-
-col1, col2, col3 = st.columns(3)
-
-col1.metric("Average Rating", round(filtered_df["product_rating"].mean(), 2))
-col2.metric("Total Reviews", filtered_df["product_rating"].count())
-col3.metric("Total Revenue", f"₹ {int(filtered_df['final_amount_inr'].sum())}")
-
-col11, col12 = st.columns(2)
-with col11:
-    st.subheader("📊 Rating Distribution")
-
-    plt.figure()
-    plt.hist(filtered_df["product_rating"].dropna(), bins=5)
-    plt.xlabel("Rating")
-    plt.ylabel("Count")
-    st.pyplot(plt)
-
-with col12:
-    st.subheader("📈 Rating vs Revenue")
-
-    rating_sales = filtered_df.groupby("product_rating")["final_amount_inr"].sum()
-
-    plt.figure()
-    plt.scatter(rating_sales.index, rating_sales.values)
-    plt.xlabel("Rating")
-    plt.ylabel("Revenue")
-    st.pyplot(plt)
-
-st.subheader("Return Rate vs Rating")
-
-return_analysis = filtered_df.groupby("product_rating")["return_status"].apply(lambda x: (x == "Returned").mean()*100)
-
-plt.figure()
-plt.plot(return_analysis.index, return_analysis.values)
-plt.xlabel("Rating")
-plt.ylabel("Return Rate (%)")
-st.pyplot(plt)
 
+rating_section(distinct("subcategory"))
 
 st.divider()
 
-st.header("🚀 New Product Launch Dashboard")
-first_sale = df.groupby("product_id")["order_year"].min().reset_index()
-first_sale.columns = ["product_id", "launch_year"]
-
-df = df.merge(first_sale, on="product_id", how="left")
-launch_df = df[df["order_year"] == df["launch_year"]]
-
-st.subheader("Filter Options")
-
-selected_year = st.selectbox(
-    "Select Launch Year",
-    sorted(launch_df["launch_year"].unique())
-)
-launch_df = launch_df[launch_df["launch_year"] == selected_year]
-
-col1, col2, col3, col4 = st.columns(4)
-
-col1.metric("Total Launch Revenue", f"₹ {int(launch_df['final_amount_inr'].sum())}")
-col2.metric("Products Launched", launch_df["product_id"].nunique())
-col3.metric("Avg Launch Rating", round(launch_df["product_rating"].mean(), 2))
-col4.metric("Launch Return Rate (%)", round((launch_df["return_status"] == "Returned").mean()*100, 2))
-
-col7, col8 = st.columns(2)
-
-with col7:
-    st.subheader("Top Launch Products by Revenue")
-    top_launch = launch_df.groupby("product_name")["final_amount_inr"].sum().sort_values(ascending=False).head(10)
-
-    plt.figure()
-    plt.barh(top_launch.index, top_launch.values)
-    plt.xlabel("Revenue")
-    plt.gca().invert_yaxis()
-    st.pyplot(plt)
-
-with col8:
-    st.subheader("📊 Launch Revenue by Category")
-    category_launch = launch_df.groupby("subcategory")["final_amount_inr"].sum()
-
-    plt.figure()
-    plt.bar(category_launch.index, category_launch.values)
-    plt.xticks(rotation=45)
-    st.pyplot(plt)
\ No newline at end of file
+launch_section(section_metrics("products"))
\ No newline at end of file
@@ -0,0 +1,26 @@
+import numpy as np
+
+from analytics.anomalies import MISSING, detect_anomalies, monthly_matrix
+from analytics.synthetic import make_dataset
+
+
+def test_null_slice_key_is_its_own_slice():
+    df = make_dataset(5_000, years=(2022, 2024))
+    df.loc[df.index[::7], "customer_state"] = None
+
+    labels, index, revenue, orders, totals = monthly_matrix(df, [("customer_state",), ("customer_state", "subcategory")])
+
+    states = labels[labels["dimension"] == "customer_state"]
+    assert MISSING in set(states["slice"])
+    # Every row is counted once per dimension, nulls included.
+    assert orders[states.index].sum() == len(df)
+    np.testing.assert_allclose(revenue[states.index].sum(axis=0), totals)
+
+
+def test_detect_anomalies_runs_with_null_slice_keys():
+    df = make_dataset(5_000, years=(2022, 2024))
+    df.loc[df.index[::5], "payment_method"] = None
+
+    anomalies = detect_anomalies(df)
+
+    assert list(anomalies.columns[:3]) == ["dimension", "slice", "month"]
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from analytics.normalize import CITY_ALIASES, Normalizer
+
+COUNTS = {
+    "Kolkata": 1000,
+    "kolkatta": 3,
+    "Hyderabad": 1000,
+    "hyderbad": 2,
+    "Bangalore": 1000,
+    "bangalor": 2,
+    "Jaipur": 500,
+    "Raipur": 400,
+    "Nashik": 300,
+    "xqzpl": 1,
+}
+
+
+def normalized():
+    values = pd.Series([v for v, n in COUNTS.items() for _ in range(n)], name="customer_city")
+    normalizer = Normalizer(CITY_ALIASES)
+    return normalizer, normalizer.normalize(values)
+
+
+def test_rare_single_typos_are_applied():
+    normalizer, _ = normalized()
+
+    assert normalizer.resolve("kolkatta")[:2] == ("kolkata", "fuzzy")
+    assert normalizer.resolve("hyderbad")[:2] == ("hyderabad", "fuzzy")
+    assert normalizer.resolve("bangalor")[:2] == ("bangalore", "fuzzy")
+
+
+def test_close_distinct_cities_go_to_review():
+    normalizer, result = normalized()
+
+    canonical, method, _, suggested = normalizer.resolve("Raipur")
+    assert (canonical, method, suggested) == ("raipur", "review", "jaipur")
+    assert (result == "raipur").sum() == COUNTS["Raipur"]
+    assert "raipur" not in normalizer.exact
+
+
+def test_frequent_unknown_city_becomes_canonical():
+    normalizer, _ = normalized()
+
+    assert normalizer.resolve("Nashik")[:2] == ("nashik", "exact")
+
+
+def test_rare_far_off_value_is_not_promoted():
+    normalizer, _ = normalized()
+
+    assert "xqzpl" not in normalizer.exact
+    assert normalizer.resolve("xqzpl")[:2] == ("xqzpl", "unmatched")
+
+
+def test_matches_without_counts_go_to_review():
+    assert Normalizer(CITY_ALIASES).resolve("kolkatta")[:2] == ("kolkatta", "review")
@@ -0,0 +1,24 @@
+import os
+
+from analytics.shared import RETAIN_SUPERSEDED, remove_superseded
+
+
+def _touch(root, version, mtime):
+    path = os.path.join(root, f"dataset-{version}.arrow")
+    open(path, "wb").close()
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_superseded_files_are_kept_for_the_retention_window(tmp_path):
+    now = 1_000_000.0
+    oldest = _touch(tmp_path, "20240101000000-1", now - 3 * RETAIN_SUPERSEDED)
+    replaced_long_ago = _touch(tmp_path, "20240101000100-1", now - 2 * RETAIN_SUPERSEDED)
+    replaced_recently = _touch(tmp_path, "20240101000200-1", now - RETAIN_SUPERSEDED - 1)
+    current = _touch(tmp_path, "20240101000300-1", now - 5)
+
+    removed = remove_superseded(tmp_path, now=now)
+
+    # Only files whose successor was written more than the window ago go.
+    assert sorted(removed) == sorted([oldest, replaced_long_ago])
+    assert os.path.exists(replaced_recently) and os.path.exists(current)